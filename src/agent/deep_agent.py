@@ -1,5 +1,4 @@
 import datetime
-import asyncio
 import os
 
 from deepagents.graph import FilesystemMiddleware, SubAgentMiddleware, TodoListMiddleware
@@ -147,6 +146,13 @@ def continuation_evaluation_middleware(state: AgentState, runtime: Runtime[AppCo
 	}
 
 
+def _log_sandbox_init_failure(init) -> None:
+	"""Done-callback for the background sandbox init; tools retry ensure_ready on their own."""
+	e = init.exception()
+	if e is not None:
+		print(f"[initialize_sandbox] ✗ Background sandbox init failed: {e}", flush=True)
+
+
 @before_agent
 async def initialize_sandbox(state: AgentState, runtime: Runtime[AppContext]):
 	"""
@@ -156,7 +162,7 @@ async def initialize_sandbox(state: AgentState, runtime: Runtime[AppContext]):
 	- Anthropic skills (docx/pdf/xlsx/pptx) installed via npx into /.solven/skills/
 	- Local escrituras skills synced into /.solven/skills/
 	
-	Uses asyncio.to_thread to avoid blocking the async event loop.
+	Starts the setup in the background so it overlaps with the model's first turn.
 	"""
 	try:
 		from src.utils.config import get_thread_id
@@ -168,9 +174,9 @@ async def initialize_sandbox(state: AgentState, runtime: Runtime[AppContext]):
 			else:
 				ctx.workspace_id = thread_id
 		backend = get_backend(runtime)
-		await asyncio.to_thread(backend.ensure_ready)
-		if not backend.is_available():
-			print("[initialize_sandbox] Sandbox not available after ensure_ready", flush=True)
+		# Don't block the first model call on the cold start: tools wait for it only if it is still running.
+		init = backend.start_initialization()
+		init.add_done_callback(_log_sandbox_init_failure)
 	except Exception as e:
 		print(f"[initialize_sandbox] ✗ Error initializing sandbox: {e}", flush=True)
 		import traceback
@@ -1,8 +1,23 @@
+import asyncio
 import os
+import weakref
 import httpx
 from typing import Optional
 from langchain_core.tools import tool
 
+# One client per event loop: an httpx async pool cannot be used from a loop other than the one that created it.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def _client() -> httpx.AsyncClient:
+    """Running loop's client for catastro-api.es: keeps connections (and their TLS sessions) alive across tool calls."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = httpx.AsyncClient()
+    return client
+
+
 @tool
 async def obtener_numeros_via(
     provincia: str,
@@ -39,10 +54,9 @@ async def obtener_numeros_via(
         }
         headers = {"X-API-Key": api_key}
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        response = await _client().get(url, params=params, headers=headers)
+        response.raise_for_status()
+        return response.json()
     except Exception as e:
         return {"error": str(e)}
 
@@ -101,10 +115,9 @@ async def buscar_inmueble_localizacion(
         
         headers = {"X-API-Key": api_key}
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        response = await _client().get(url, params=params, headers=headers)
+        response.raise_for_status()
+        return response.json()
     except Exception as e:
         return {"error": str(e)}
 
@@ -132,10 +145,9 @@ async def buscar_inmueble_rc(rc: str):
         params = {"rc": rc}
         headers = {"X-API-Key": api_key}
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        response = await _client().get(url, params=params, headers=headers)
+        response.raise_for_status()
+        return response.json()
     except Exception as e:
         return {"error": str(e)}
 
@@ -156,10 +168,9 @@ async def obtener_provincias():
         url = "https://catastro-api.es/api/callejero/provincias"
         headers = {"X-API-Key": api_key}
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        response = await _client().get(url, headers=headers)
+        response.raise_for_status()
+        return response.json()
     except Exception as e:
         return {"error": str(e)}
 
@@ -189,10 +200,9 @@ async def obtener_municipios(provincia: str, municipio: Optional[str] = None):
         
         headers = {"X-API-Key": api_key}
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        response = await _client().get(url, params=params, headers=headers)
+        response.raise_for_status()
+        return response.json()
     except Exception as e:
         return {"error": str(e)}
 
@@ -244,9 +254,8 @@ async def obtener_vias(
         
         headers = {"X-API-Key": api_key}
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        response = await _client().get(url, params=params, headers=headers)
+        response.raise_for_status()
+        return response.json()
     except Exception as e:
         return {"error": str(e)}
\ No newline at end of file
@@ -19,36 +19,13 @@ from pydantic import BaseModel, Field
 
 from datetime import datetime, timezone
 import json
-import os
 
-from src.embeddings import embeddings
-from supabase import create_async_client
-from langchain_postgres import PGVectorStore
-from src.utils.vector_store import get_pg_engine
+from src.utils.supabase_client import get_supabase
+from src.utils.vector_store import get_vector_store
 from src.models import AppContext
 from src.utils.config import get_user, get_thread_id
 from src.agent_customer_chat.models import Accion
 
-SUPABASE_URL = os.environ["SUPABASE_URL"]
-SUPABASE_SERVICE_KEY = os.environ.get("SUPABASE_SECRET_KEY")
-
-
-# ---------------------------------------------------------------------------
-# Helpers
-# ---------------------------------------------------------------------------
-
-async def _get_pg_vector_store():
-    pg_engine = await get_pg_engine()
-    return await PGVectorStore.create(
-        engine=pg_engine,
-        table_name="documents",
-        embedding_service=embeddings,
-        id_column="id",
-        content_column="content",
-        embedding_column="embedding",
-        metadata_json_column="metadata",
-    )
-
 
 # ---------------------------------------------------------------------------
 # Tool 1: listar_solicitudes_cliente
@@ -82,7 +59,7 @@ async def listar_solicitudes_cliente(runtime: ToolRuntime[AppContext]) -> ToolMe
                 name="listar_solicitudes_cliente",
             )
 
-        supabase = await create_async_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+        supabase = await get_supabase()
 
         # Prefer filtering by customer_id (auth user ID) for chat-originated tickets;
         # fall back to customer_email for email-originated tickets
@@ -181,7 +158,7 @@ async def crear_solicitud(
                 name="crear_solicitud",
             )
 
-        supabase = await create_async_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+        supabase = await get_supabase()
 
         # Single unique ticket per thread: id == thread_id always.
         # Idempotency: if ticket already exists, return without duplicating.
@@ -218,7 +195,7 @@ async def crear_solicitud(
             "created_at": now,
         }
         doc = Document(id=thread_id, page_content=descripcion, metadata=doc_metadata)
-        vector_store = await _get_pg_vector_store()
+        vector_store = await get_vector_store()
         try:
             await vector_store.aadd_documents([doc])
         except Exception as e:
@@ -301,7 +278,7 @@ async def leer_solicitud(runtime: ToolRuntime[AppContext]) -> ToolMessage:
                 name="leer_solicitud",
             )
 
-        supabase = await create_async_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+        supabase = await get_supabase()
 
         ticket_resp = (
             await supabase.table("tickets")
@@ -445,7 +422,7 @@ async def actualizar_solicitud(
                 name="actualizar_solicitud",
             )
 
-        supabase = await create_async_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+        supabase = await get_supabase()
 
         check = (
             await supabase.table("tickets")
@@ -494,7 +471,7 @@ async def actualizar_solicitud(
                 updated_meta["priority"] = prioridad
             new_content = descripcion if descripcion is not None else existing_content
 
-            vector_store = await _get_pg_vector_store()
+            vector_store = await get_vector_store()
             updated_doc = Document(
                 id=document_id, page_content=new_content, metadata=updated_meta
             )
@@ -8,15 +8,9 @@ from src.agent_triage.models import Ticket, Accion, CrearTicketInput, GestionarA
 from src.models import AppContext
 import uuid
 from datetime import datetime, timezone
-import os
 
-from src.embeddings import embeddings
-from supabase import create_async_client
-from langchain_postgres import PGVectorStore
-from src.utils.vector_store import get_pg_engine
-
-SUPABASE_URL = os.environ["SUPABASE_URL"]
-SUPABASE_SERVICE_KEY = os.environ.get("SUPABASE_SECRET_KEY")
+from src.utils.supabase_client import get_supabase
+from src.utils.vector_store import get_vector_store
 
 from src.utils.tickets import get_ticket
 from src.utils.config import get_user
@@ -82,7 +76,7 @@ async def seleccionar_ticket(ticket_id: str, runtime: ToolRuntime[AppContext]) -
                 tool_call_id=runtime.tool_call_id,
                 name="seleccionar_ticket",
             )
-        supabase_async = await create_async_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+        supabase_async = await get_supabase()
         ticket_response = await supabase_async.table("tickets").select("id").eq("id", ticket_id).eq("company_id", company_id).execute()
         if not ticket_response.data or len(ticket_response.data) == 0:
             return ToolMessage(
@@ -126,7 +120,7 @@ async def leer_ticket(ticket_id: str, runtime: ToolRuntime[AppContext]) -> ToolM
                 name="leer_ticket",
             )
 
-        supabase_async = await create_async_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+        supabase_async = await get_supabase()
         
         # Verify ticket belongs to user's company
         ticket_response = await supabase_async.table("tickets").select("*").eq("id", ticket_id).eq("company_id", company_id).execute()
@@ -171,7 +165,7 @@ async def leer_ticket(ticket_id: str, runtime: ToolRuntime[AppContext]) -> ToolM
                 name="leer_ticket",
             )
         
-        supabase = await create_async_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+        supabase = await get_supabase()
         
         # Fetch document content and verify it belongs to the company
         doc_response = await supabase.table("documents").select("content, metadata").eq("id", document_id).execute()
@@ -280,7 +274,7 @@ async def crear_ticket(
         if prioridad not in valid_priorities:
             prioridad = 'medium'
 
-        supabase_async = await create_async_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+        supabase_async = await get_supabase()
 
         # Check if client already exists for this email and company
         print(f"[DEBUG] Checking if client exists for email {correo_cliente} and company {company_id}...", flush=True)
@@ -350,18 +344,8 @@ async def crear_ticket(
             metadata=document_metadata
         )
         
-        # Get PGEngine and create vector store using existing table schema
-        pg_engine = await get_pg_engine()
-        vector_store = await PGVectorStore.create(
-            engine=pg_engine,
-            table_name="documents",
-            embedding_service=embeddings,
-            # Map to existing column names
-            id_column="id",
-            content_column="content",
-            embedding_column="embedding",
-            metadata_json_column="metadata",
-        )
+        # Shared vector store over the existing table schema
+        vector_store = await get_vector_store()
         
         # Add document with embeddings (async, following PGVectorStore docs)
         try:
@@ -472,7 +456,7 @@ async def patch_ticket(
     - rejection_reason: razón del rechazo (opcional, requerido si se rechaza)
     """
     try:
-        supabase_async = await create_async_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+        supabase_async = await get_supabase()
         
         if prioridad and prioridad not in ['low', 'medium', 'high', 'urgent']:
             return ToolMessage(
@@ -566,18 +550,8 @@ async def patch_ticket(
             if prioridad:
                 updated_metadata["priority"] = prioridad
             
-            # Get PGEngine and create vector store for updating
-            pg_engine = await get_pg_engine()
-            vector_store = await PGVectorStore.create(
-                engine=pg_engine,
-                table_name="documents",
-                embedding_service=embeddings,
-                # Map to existing column names
-                id_column="id",
-                content_column="content",
-                embedding_column="embedding",
-                metadata_json_column="metadata",
-            )
+            # Shared vector store for updating
+            vector_store = await get_vector_store()
             
             # Upsert document with updated content and embeddings (keeping same ID)
             # PGVectorStore.aadd_documents will update existing document if ID matches
@@ -690,7 +664,7 @@ async def descartar_evento(
                 }
             )
 
-        supabase_async = await create_async_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+        supabase_async = await get_supabase()
         
         # Note: We don't create clients in descartar_evento - only crear_ticket creates new clients
         # Check if client exists for logging purposes only
@@ -729,17 +703,8 @@ async def descartar_evento(
             metadata=document_metadata
         )
         
-        # Get PGEngine and create vector store using existing table schema
-        pg_engine = await get_pg_engine()
-        vector_store = await PGVectorStore.create(
-            engine=pg_engine,
-            table_name="documents",
-            embedding_service=embeddings,
-            id_column="id",
-            content_column="content",
-            embedding_column="embedding",
-            metadata_json_column="metadata",
-        )
+        # Shared vector store over the existing table schema
+        vector_store = await get_vector_store()
         
         # Add document with embeddings
         try:
@@ -874,7 +839,7 @@ async def merge_tickets(ticket_ids: list[str], runtime: ToolRuntime[AppContext]
             )
 
         
-        supabase_async = await create_async_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+        supabase_async = await get_supabase()
         
         # Generate new UUID for merged ticket
         merged_ticket_id = str(uuid.uuid4())
@@ -996,18 +961,8 @@ async def merge_tickets(ticket_ids: list[str], runtime: ToolRuntime[AppContext]
         # Create new merged document with embeddings using PGVectorStore
         print(f"[DEBUG] Creating merged document {merged_ticket_id} with embeddings...", flush=True)
         
-        # Get PGEngine and create vector store using existing table schema
-        pg_engine = await get_pg_engine()
-        vector_store = await PGVectorStore.create(
-            engine=pg_engine,
-            table_name="documents",
-            embedding_service=embeddings,
-            # Map to existing column names
-            id_column="id",
-            content_column="content",
-            embedding_column="embedding",
-            metadata_json_column="metadata",
-        )
+        # Shared vector store over the existing table schema
+        vector_store = await get_vector_store()
         
         # Create LangChain Document object
         merged_doc = Document(
@@ -1114,7 +1069,7 @@ async def leer_acciones(ticket_id: str, runtime: ToolRuntime[AppContext]) -> Too
                 name="leer_acciones",
             )
 
-        supabase_async = await create_async_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+        supabase_async = await get_supabase()
         
         # Verify ticket exists and belongs to user's company
         ticket_check = await supabase_async.table("tickets").select("id, title").eq("id", ticket_id).eq("company_id", company_id).execute()
@@ -1195,7 +1150,7 @@ async def gestionar_acciones(
 
         created_by = user.id
         
-        supabase_async = await create_async_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+        supabase_async = await get_supabase()
         
         # Verify ticket exists and belongs to user's company
         ticket_check = await supabase_async.table("tickets").select("id").eq("id", ticket_id).eq("company_id", company_id).execute()
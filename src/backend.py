@@ -8,10 +8,11 @@ import re
 from langchain.tools import ToolRuntime
 import yaml
 from datetime import datetime
-from typing import Optional, Union
+from typing import Callable, Optional, TypeVar, Union
 from fnmatch import fnmatch
 import asyncio
 import boto3
+from concurrent.futures import ThreadPoolExecutor
 from botocore.exceptions import ClientError
 from deepagents.backends.protocol import (
     BackendProtocol,
@@ -24,9 +25,26 @@ from deepagents.backends.protocol import (
 from deepagents.backends.utils import FileInfo, GrepMatch
 
 from src.models import AppContext
+from src.utils import _SKILLMD_FRONTMATTER_RE
 from src.utils.document_conversion import convert_bytes_to_markdown
 
 
+# Concurrent S3 requests per download_files / upload_files batch; stays under botocore's default
+# connection pool (10) so workers never queue for a connection.
+_S3_BATCH_CONCURRENCY = 8
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+def _map_concurrently(func: Callable[[_T], _R], items: list[_T]) -> list[_R]:
+    """``list(map(func, items))`` with the calls overlapped on a small thread pool (single items run inline)."""
+    if len(items) <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(_S3_BATCH_CONCURRENCY, len(items))) as pool:
+        return list(pool.map(func, items))
+
+
 def _parse_skillmd_frontmatter(skillmd: str) -> str:
     """
     Parse and extract the frontmatter from a skillmd file.
@@ -44,8 +62,7 @@ def _parse_skillmd_frontmatter(skillmd: str) -> str:
         The frontmatter string (content between --- delimiters), or empty string if not found
     """
     # Match YAML frontmatter between --- delimiters at the start of the file
-    frontmatter_pattern = r'^---\s*\n(.*?)\n---\s*\n'
-    match = re.match(frontmatter_pattern, skillmd, re.DOTALL)
+    match = _SKILLMD_FRONTMATTER_RE.match(skillmd)
     
     if not match:
         return ""
@@ -654,10 +671,13 @@ class _BaseS3Backend(BackendProtocol):
                         response = self.s3_client.get_object(Bucket=self.bucket, Key=key)
                         content = response['Body'].read().decode('utf-8')
                         
+                        display_path = None
                         for line_num, line in enumerate(content.split('\n'), 1):
                             if regex.search(line):
-                                # Use original filename for display if it exists
-                                display_path = self._get_original_filename(file_path)
+                                # Use original filename for display if it exists (resolved once per file:
+                                # it may cost a HEAD per candidate extension)
+                                if display_path is None:
+                                    display_path = self._get_original_filename(file_path)
                                 matches.append(GrepMatch(
                                     path=display_path,
                                     line=line_num,
@@ -1357,45 +1377,40 @@ class SolvenS3Backend(_BaseS3Backend):
         )
 
     def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
-        """Download files from S3 by virtual path; returns content as bytes per path."""
+        """Download files from S3 by virtual path; returns content as bytes per path.
+
+        GETs are independent round-trips, so batches are fetched concurrently (order preserved).
+        """
         self._ensure_bucket_exists()
-        responses = []
-        for path in paths:
+
+        def download(path: str) -> FileDownloadResponse:
             try:
                 key = self._key(path)
                 try:
                     response = self.s3_client.get_object(Bucket=self.bucket, Key=key)
                     content = response["Body"].read()
-                    responses.append(
-                        FileDownloadResponse(path=path, content=content, error=None)
-                    )
+                    return FileDownloadResponse(path=path, content=content, error=None)
                 except ClientError as e:
                     if e.response["Error"]["Code"] == "NoSuchKey":
-                        responses.append(
-                            FileDownloadResponse(
-                                path=path, content=None, error="file_not_found"
-                            )
+                        return FileDownloadResponse(
+                            path=path, content=None, error="file_not_found"
                         )
-                    else:
-                        responses.append(
-                            FileDownloadResponse(
-                                path=path,
-                                content=None,
-                                error=f"download_error: {str(e)}",
-                            )
-                        )
-            except Exception as e:
-                responses.append(
-                    FileDownloadResponse(
-                        path=path, content=None, error=f"download_error: {str(e)}"
+                    return FileDownloadResponse(
+                        path=path,
+                        content=None,
+                        error=f"download_error: {str(e)}",
                     )
+            except Exception as e:
+                return FileDownloadResponse(
+                    path=path, content=None, error=f"download_error: {str(e)}"
                 )
-        return responses
+
+        return _map_concurrently(download, paths)
 
     def upload_files(
         self, files: list[tuple[str, bytes]]
     ) -> list[FileUploadResponse]:
-        """Upload files to S3 by virtual path."""
+        """Upload files to S3 by virtual path (concurrent PUTs, order preserved)."""
         perm_error = self._check_write_permission()
         if perm_error:
             return [
@@ -1403,8 +1418,9 @@ class SolvenS3Backend(_BaseS3Backend):
                 for path, _ in files
             ]
         self._ensure_bucket_exists()
-        responses = []
-        for path, content in files:
+
+        def upload(item: tuple[str, bytes]) -> FileUploadResponse:
+            path, content = item
             try:
                 path = self._normalize_upload_path_to_adjuntos(path)
                 key = self._key(path)
@@ -1418,12 +1434,11 @@ class SolvenS3Backend(_BaseS3Backend):
                     ContentType=content_type,
                     Metadata={"uploaded-by": "agent"},
                 )
-                responses.append(FileUploadResponse(path=path, error=None))
+                return FileUploadResponse(path=path, error=None)
             except Exception as e:
-                responses.append(
-                    FileUploadResponse(path=path, error=f"upload_error: {str(e)}")
-                )
-        return responses
+                return FileUploadResponse(path=path, error=f"upload_error: {str(e)}")
+
+        return _map_concurrently(upload, files)
 
     async def adownload_files(self, paths: list[str]) -> list[FileDownloadResponse]:
         """Async version of download_files."""
@@ -1,7 +1,7 @@
 from langchain.tools import ToolRuntime
 from langchain_core.tools import tool, InjectedToolArg
 from langgraph.types import interrupt
-from src.sandbox_backend import SandboxBackend
+from src.utils.backend import get_backend
 from src.models import AppContext
 from src.utils.config import get_user, get_thread_id
 from typing import Annotated
@@ -50,7 +50,8 @@ async def solicitar_archivo(
         local_path = uploaded_file_info.get("local_path", "")  # Path where file was temporarily saved
 
         try:
-            backend : SandboxBackend = SandboxBackend(runtime)
+            # Cached per thread: reuses the already-initialized sandbox instead of a fresh cold init.
+            backend = get_backend(runtime)
             runtime.stream_writer(f"Subiendo {filename} al espacio de trabajo...")
             
             # Upload file to workspace using the new upload_file method
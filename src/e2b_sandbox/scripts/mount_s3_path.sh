@@ -41,7 +41,11 @@ if mountpoint -q "${MOUNT_POINT}" 2>/dev/null; then
     echo "[mount] Unmounting existing mount at ${MOUNT_POINT}..."
     sudo umount "${MOUNT_POINT}" 2>/dev/null || true
     sudo umount -l "${MOUNT_POINT}" 2>/dev/null || true
-    sleep 3
+    # Wait only as long as the detach actually takes (50 ms steps, 3 s ceiling)
+    for _ in $(seq 1 60); do
+        mountpoint -q "${MOUNT_POINT}" 2>/dev/null || break
+        sleep 0.05
+    done
 fi
 
 # Allow mounting over non-empty dir (e.g. leftover from previous run or mkdir -p)
@@ -65,33 +69,27 @@ nohup sudo rclone --config /root/.config/rclone/rclone.conf mount \
 RCLONE_PID=$!
 echo "[mount] rclone started with PID: ${RCLONE_PID}"
 
-# Wait for mount to initialize
+# Wait for the mount to come up: poll every 50 ms (15 s ceiling) instead of a fixed sleep,
+# bailing out early if rclone dies. A live mountpoint replaces the separate ls verification.
 echo "[mount] Waiting for mount to initialize..."
-sleep 3
-
-# Check if rclone process is still running
-if ! ps -p ${RCLONE_PID} > /dev/null 2>&1; then
-    echo "ERROR: rclone process died immediately" >&2
-    echo "Check log file: ${LOG_FILE}" >&2
-    sudo tail -20 "${LOG_FILE}" >&2 2>/dev/null || echo "No log available" >&2
-    exit 1
-fi
-
-# Verify mount is accessible (with retry). Use sudo so we run as same user that owns the mount.
-echo "[mount] Verifying mount accessibility..."
-for i in 1 2 3 4 5; do
-    if sudo ls "${MOUNT_POINT}" >/dev/null 2>&1; then
-        echo "[mount] Mount verified on attempt $i"
+for i in $(seq 1 300); do
+    if mountpoint -q "${MOUNT_POINT}" 2>/dev/null; then
+        echo "[mount] Mount ready after ${i} checks"
         break
     fi
-    if [ $i -eq 5 ]; then
-        echo "ERROR: Mount point ${MOUNT_POINT} is not accessible after 5 attempts" >&2
+    if ! ps -p ${RCLONE_PID} > /dev/null 2>&1; then
+        echo "ERROR: rclone process died immediately" >&2
+        echo "Check log file: ${LOG_FILE}" >&2
+        sudo tail -20 "${LOG_FILE}" >&2 2>/dev/null || echo "No log available" >&2
+        exit 1
+    fi
+    if [ $i -eq 300 ]; then
+        echo "ERROR: Mount point ${MOUNT_POINT} did not come up within 15s" >&2
         echo "Check log file: ${LOG_FILE}" >&2
         sudo tail -20 "${LOG_FILE}" >&2 2>/dev/null || echo "No log available" >&2
         exit 1
     fi
-    echo "[mount] Attempt $i failed, retrying..."
-    sleep 1
+    sleep 0.05
 done
 
 echo "[rclone] ✓ Mounted ${BUCKET}/${S3_PATH} to ${MOUNT_POINT}"
@@ -121,7 +121,11 @@ mount_and_verify() {
     --dir-cache-time 2s \
     --daemon > ${log_file} 2>&1
   
-  sleep 3
+  # Poll for the mount (50 ms steps, 10 s ceiling) instead of a fixed sleep; the check below then runs once
+  for _ in $(seq 1 200); do
+    mountpoint -q ${mount_point} 2>/dev/null && break
+    sleep 0.05
+  done
   
   # Verify mount is active
   if mountpoint -q ${mount_point} 2>/dev/null || mount | grep -q "${mount_point}"; then
@@ -149,13 +149,24 @@ template = (
     # Create directory for rclone config (config will be created at runtime)
     .run_cmd("mkdir -p /root/.config/rclone", user="root")
     # ============================================================================
-    # Start Command - Rclone mount workspace: layout, optional skills clone
+    # Pre-baked Skills Checkout
+    # ============================================================================
+    # Shallow clone at build time so the backend only has to fetch+reset on first use instead of a cold clone.
+    # Anonymous only (no credentials baked into the image): if the repo is private this is a no-op and the
+    # backend clones at runtime as before.
+    .run_cmd(
+        f"mkdir -p /opt/solven && GIT_TERMINAL_PROMPT=0 git clone --depth=1 {SKILLS_REPO_URL} {OPT_SOLVEN_SKILLS} "
+        f"|| {{ rm -rf {OPT_SOLVEN_SKILLS}; mkdir -p {OPT_SOLVEN_SKILLS}; }}",
+        user="root",
+    )
+    # ============================================================================
+    # Start Command - Rclone mount workspace: layout (skills checkout pre-baked above when public)
     # ============================================================================
     # Mounts are configured by sandbox_backend.py on first use (no credentials at build time).
     .set_start_cmd(
         """
         set -e
-        sudo mkdir -p /root/.config/rclone /workspaces /opt/solven/skills /var/lib/solven/locks /tmp/rclone-cache
+        sudo mkdir -p /root/.config/rclone /workspaces /opt/solven/skills /var/lib/solven/locks
         echo "[Template] Sandbox boot complete (skills repo and mounts configured by backend per workspace)"
         """,
         wait_for_timeout(2_000)
@@ -15,6 +15,8 @@ from botocore.config import Config
 from deepagents.backends.protocol import BackendProtocol, WriteResult, EditResult
 from deepagents.backends.utils import FileInfo, GrepMatch
 
+from src.utils import _SKILLMD_FRONTMATTER_RE
+
 
 def _parse_skillmd_frontmatter(skillmd: str) -> str:
     """
@@ -33,8 +35,7 @@ def _parse_skillmd_frontmatter(skillmd: str) -> str:
         The frontmatter string (content between --- delimiters), or empty string if not found
     """
     # Match YAML frontmatter between --- delimiters at the start of the file
-    frontmatter_pattern = r'^---\s*\n(.*?)\n---\s*\n'
-    match = re.match(frontmatter_pattern, skillmd, re.DOTALL)
+    match = _SKILLMD_FRONTMATTER_RE.match(skillmd)
     
     if not match:
         return ""
@@ -605,10 +606,13 @@ class S3Backend(BackendProtocol):
                         response = self.s3_client.get_object(Bucket=self.bucket, Key=key)
                         content = response['Body'].read().decode('utf-8')
                         
+                        display_path = None
                         for line_num, line in enumerate(content.split('\n'), 1):
                             if regex.search(line):
-                                # Use original filename for display if it exists
-                                display_path = self._get_original_filename(file_path)
+                                # Use original filename for display if it exists (resolved once per file:
+                                # it may cost a HEAD per candidate extension)
+                                if display_path is None:
+                                    display_path = self._get_original_filename(file_path)
                                 matches.append(GrepMatch(
                                     path=display_path,
                                     line=line_num,
@@ -6,19 +6,47 @@ ARCHITECTURE:
 """
 
 import base64
+import contextlib
+import contextvars
+import functools
+import hashlib
+import io
+import itertools
+import json
 import logging
 import os
 import re
 import shlex
+import tarfile
+import threading
+import uuid
+import weakref
 import asyncio
 import time as _time
-from pathlib import Path
-from typing import Optional
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from functools import cache, cached_property
+from typing import Any, Callable, NamedTuple, Optional, TypeVar
 
 # Process-level cache: one sandbox_id per user_id so we always reuse the same sandbox (avoids duplicates from dev restarts/sync).
 _user_sandbox_cache: dict[str, str] = {}
-
-from e2b import Sandbox, SandboxQuery, SandboxState
+# Connected handles (user_id -> (Sandbox, monotonic time)): backends built for the same user within
+# _SANDBOX_HANDLE_TTL_SEC share the handle instead of paying another Sandbox.connect round-trip.
+_user_sandbox_handles: dict[str, tuple["Sandbox", float]] = {}
+_SANDBOX_HANDLE_TTL_SEC = 60.0
+# Waits between reconnect attempts when listed sandboxes refuse the first connect (e.g. still resuming).
+_SANDBOX_RECONNECT_BACKOFF_SEC = (0.25, 0.5, 1.25)
+# loop -> sandbox_id -> AsyncSandbox handle used by aexecute (connected on first use; dropped after a failed
+# command). Per loop because each handle's httpx pool belongs to the loop that created it.
+_async_sandbox_handles: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, AsyncSandbox]]" = (
+	weakref.WeakKeyDictionary()
+)
+# sandbox_id -> fingerprint of the rclone config this process last installed or verified there.
+_rclone_configured: dict[str, str] = {}
+
+from e2b import AsyncSandbox, Sandbox, SandboxQuery, SandboxState
 from e2b.sandbox.commands.command_handle import CommandExitException
 
 from deepagents.backends.sandbox import BaseSandbox
@@ -27,18 +55,41 @@ from deepagents.backends.utils import FileInfo, GrepMatch
 from langchain.tools import ToolRuntime
 from src.models import AppContext
 from src.backend import _parse_skillmd_frontmatter
-from src.utils.config import get_user
+from src.utils.config import get_user, get_workspace_id
 from src.utils.document_conversion import convert_bytes_to_markdown
-# Workspace and user models (S3 mount at /mnt/user) via rclone in-sandbox; no s3_utils for tar/manifest.
+# Workspace and user models are synced with rclone straight against S3 (no FUSE mount); no s3_utils for tar/manifest.
 
 SANDBOX_TEMPLATE = "solven-sandbox-v1"
 SKILLS_REPO_URL = "https://github.com/metalossAI/solven-skills.git"
+# Branch, tag or commit the skills checkout tracks; set SKILLS_REPO_REF to pin a reviewed revision.
+SKILLS_REPO_REF = os.getenv("SKILLS_REPO_REF", "main")
 
 SOLVEN_LOCKS = "/var/lib/solven/locks"  # Reserved for sandbox-local coordination
 OPT_SOLVEN_SKILLS = "/opt/solven/skills"
 OPT_SOLVEN_USER_MODELS = "/opt/solven/user-models"
 OPT_SOLVEN_USER_MODELS_NORMALIZED = "/opt/solven/user-models/templates_normalized"  # Writable; syncs to S3 templates/normalized/
-RCLONE_CACHE_BASE = "/tmp/rclone-cache"
+
+# Shared rclone flags (config + transfer tuning) and the dirs never synced between workspace and S3.
+# Workspaces are mostly many small files, so per-object round-trips dominate: keep more transfers/checkers in flight.
+# --checksum compares size + MD5 (the ETag from the listing) instead of the mtime rclone keeps in S3 object
+# metadata, which costs a HEAD per object on every check.
+_RCLONE_BASE_FLAGS = "--config /root/.config/rclone/rclone.conf --fast-list --checksum --no-update-modtime"
+_RCLONE_FLAGS = f"{_RCLONE_BASE_FLAGS} --transfers 16 --checkers 16"
+# Blocking whole-workspace transfers (initial hydrate, explicit persist) run while a request waits on them:
+# use twice the streams. Background syncs keep the lighter setting so concurrent threads share the sandbox NIC.
+_RCLONE_BULK_FLAGS = f"{_RCLONE_BASE_FLAGS} --transfers 32 --checkers 32"
+_RCLONE_WORKSPACE_EXCLUDES = (
+    "--exclude '.solven/**' --exclude '.venv/**' --exclude 'node_modules/**' --exclude '.bun/**' --exclude '.git/**' "
+    # bytecode caches (at any depth): many tiny objects, rebuilt on first import
+    "--exclude '__pycache__/**'"
+)
+
+# find prune expression (run from the workspace root) for the local change scans before a sync: the dirs
+# _RCLONE_WORKSPACE_EXCLUDES keeps out of S3.
+_WORKSPACE_SYNC_PRUNE_EXPR = (
+    " -o ".join(f"-path ./{d}" for d in (".solven", ".venv", "node_modules", ".bun", ".git"))
+    + " -o -name __pycache__"
+)
 
 # Dirs skipped during in-workspace glob / grep searches (caches, mounts, system).
 _WORKSPACE_SEARCH_SKIP_DIRS = frozenset({
@@ -46,11 +97,31 @@ _WORKSPACE_SEARCH_SKIP_DIRS = frozenset({
     "bin", "sbin", "lib", "lib64",
     "node_modules", ".venv", "venv", "env", ".bun", ".git", "mnt",
 })
+# Shell fragments derived from the skip dirs, built once: find prune expression and grep --exclude-dir args.
+_WORKSPACE_SEARCH_PRUNE_EXPR = " -o ".join(f"-type d -name {shlex.quote(d)}" for d in sorted(_WORKSPACE_SEARCH_SKIP_DIRS))
+_WORKSPACE_SEARCH_GREP_EXCLUDES = " ".join(f"--exclude-dir={shlex.quote(d)}" for d in sorted(_WORKSPACE_SEARCH_SKIP_DIRS))
+_WORKSPACE_SEARCH_RG_EXCLUDES = " ".join(f"-g {shlex.quote('!' + d)}" for d in sorted(_WORKSPACE_SEARCH_SKIP_DIRS))
+
+# ripgrep flags matching `grep -rHnF` semantics (literal, hidden files, no .gitignore), with long lines
+# (minified JS, base64 blobs) cut to a preview so a single match cannot blow up the output.
+_RG_GREP_FLAGS = (
+    "--no-config --no-messages --color=never --no-heading --with-filename --line-number "
+    "--fixed-strings --hidden --no-ignore --max-columns=512 --max-columns-preview"
+)
+
+# `path:line:text` lines as printed by rg/grep -Hn.
+_GREP_LINE_RE = re.compile(r"^(.+?):(\d+):(.*)$", re.MULTILINE)
+# `size|mtime|path` rows from find -printf in glob_info (path last, so '|' in names is safe).
+_FIND_FILE_ROW_RE = re.compile(r"^(\d*)\|([^|\n]*)\|(.+)$", re.MULTILINE)
+# `type<TAB>size<TAB>mtime<TAB>path` rows from find -printf in ls_info.
+_LS_ROW_RE = re.compile(r"^(\w)\t(\d*)\t([^\t\n]*)\t(.+)$", re.MULTILINE)
 
 # Top-level names to hide from agent in ls_info/glob_info/grep_raw (bwrap exposes /usr, /etc, etc.).
 _AGENT_HIDDEN_TOPLEVEL = frozenset({
     "mnt", "usr", "etc", "proc", "dev", "sys", "run", "lib", "lib64", "bin", "sbin", "tmp", "cache",
 })
+# find predicates excluding the hidden top-level names (applied when listing "/").
+_AGENT_HIDDEN_TOPLEVEL_FIND_EXPR = " ".join(f"! -name {shlex.quote(d)}" for d in sorted(_AGENT_HIDDEN_TOPLEVEL))
 
 # Document extensions that require Modal/Docling conversion (documents, not code/text).
 # Images are intentionally excluded so the model can handle them directly.
@@ -78,12 +149,314 @@ _IMAGE_MIME_TYPES = {
     ".bmp": "image/bmp",
 }
 
+# Install commands execute() refuses: deps go through uv (Python) and bun (Node).
+# One alternation, one scan per command; the named group that matched selects the message.
+_UNWANTED_COMMAND_RE = re.compile(
+    r"(?P<sudo>\bsudo\b)"
+    r"|(?P<apt_get>\bapt-get\s+(?:install|update)\b)"
+    r"|(?P<apt>\bapt\s+(?:install|update)\b)"
+    r"|(?P<pip>pip\s+install)"
+    r"|(?P<npm>npm\s+install\b|npm\s+i\s)",
+    re.IGNORECASE,
+)
+_UNWANTED_COMMAND_MESSAGES = {
+    "sudo": "Not allowed: sudo is not allowed in sandbox environment.",
+    "apt_get": "Not allowed: apt-get is not allowed (system packages pre-installed).",
+    "apt": "Not allowed: apt is not allowed (system packages pre-installed).",
+    "pip": "Not allowed: use uv for Python dependencies (e.g. uv add <pkg> or uv sync).",
+    "npm": "Not allowed: use bun for Node dependencies (e.g. bun add <pkg> or bun install).",
+}
+
+# Programs that never touch the workspace. execute() skips the post-command S3 sync only when every simple
+# command in the line is one of these: anything unknown syncs, since a missed write loses data while a needless
+# sync costs one local find (the upload is skipped when nothing changed since the last sync).
+_READ_ONLY_PROGRAMS = frozenset({
+    "ls", "cat", "head", "tail", "wc", "grep", "egrep", "fgrep", "rg", "find", "cd", "pwd", "echo", "stat", "du",
+})
+# git subcommands that never touch the working tree (.git itself is never synced); only when directly after "git"
+_READ_ONLY_GIT_SUBCOMMANDS = frozenset({
+    "status", "log", "diff", "show", "blame", "grep", "ls-files", "rev-parse", "describe", "shortlog",
+})
+# find actions that delete, write or run other programs
+_FIND_WRITE_ACTION_RE = re.compile(r"(?:^|\s)-(?:delete|exec|execdir|ok|okdir|fprint0?|fprintf|fls)\b")
+# Separators between simple commands: pipes, && / || lists, ; & and newlines
+_SHELL_COMMAND_SEPARATOR_RE = re.compile(r"\|\|?|&&|[;&\n]")
+# Command and process substitutions can run anything
+_SHELL_SUBSTITUTION_RE = re.compile(r"\$\(|`|[<>]\(")
+# Redirections that never write into the workspace (stripped before looking for other redirections).
+_NON_WRITING_REDIRECT_RE = re.compile(r"\d*>>?\s*/dev/null|\d*>&\d")
+
+
+def _command_is_read_only(command: str) -> bool:
+	"""Return True only if ``command`` is certainly read-only (allow-listed programs or git subcommands, no redirection into files)."""
+	if ">" in command:
+		command = _NON_WRITING_REDIRECT_RE.sub(" ", command)
+		if ">" in command:
+			return False
+	if _SHELL_SUBSTITUTION_RE.search(command):
+		return False
+	for part in _SHELL_COMMAND_SEPARATOR_RE.split(command):
+		words = part.split()
+		if not words:
+			continue
+		if words[0] == "git":
+			# --output makes diff/log/show write a file
+			if len(words) < 2 or words[1] not in _READ_ONLY_GIT_SUBCOMMANDS or "--output" in part:
+				return False
+			continue
+		if words[0] not in _READ_ONLY_PROGRAMS:
+			return False
+		if words[0] == "find" and _FIND_WRITE_ACTION_RE.search(part):
+			return False
+	return True
+
+
+class _FileRow(NamedTuple):
+	"""Compact, immutable glob_info / ls_info row (what the search cache stores); FileInfo dicts are built on return."""
+
+	path: str
+	size: int
+	modified_at: str | None
+	is_dir: bool = False
+
+	def to_file_info(self) -> FileInfo:
+		return {"path": self.path, "is_dir": self.is_dir, "size": self.size, "modified_at": self.modified_at}
+
+
+class _GrepRow(NamedTuple):
+	"""Compact, immutable grep_raw row (what the search cache stores); GrepMatch dicts are built on return."""
+
+	path: str
+	line: int
+	text: str
+
+	def to_grep_match(self) -> GrepMatch:
+		return {"path": self.path, "line": self.line, "text": self.text}
+
+
+@functools.lru_cache(maxsize=4096)
+def _utc_isoformat(epoch_seconds: int) -> str:
+	"""ISO-8601 UTC timestamp; memoized because files in a listing tend to share mtimes (extracted/hydrated together)."""
+	return datetime.fromtimestamp(epoch_seconds, tz=UTC).isoformat()
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_agent_path(path: str, workspace: str, thread_id: str) -> str:
+	"""Pure body of ``SandboxBackend._normalize_agent_path``; memoized since agents keep passing the same paths."""
+	if not path or not path.strip():
+		return "/"
+	p = path.strip()
+	if "\\" in p:
+		p = p.replace("\\", "/")
+	if p in (".", "./"):
+		return "/"
+	if not p.startswith("/"):
+		p = "/" + p
+	p = p.rstrip("/") or "/"
+	if p == workspace or p.startswith(workspace + "/"):
+		rest = p[len(workspace) :].lstrip("/")
+		return f"/{rest}" if rest else "/"
+	# Legacy: /workspaces[/thread_id][/...]
+	if p == "/workspaces" or p.startswith("/workspaces/"):
+		rest = p[len("/workspaces") :].lstrip("/")
+		if rest.startswith(thread_id + "/"):
+			rest = rest[len(thread_id) + 1 :]
+		elif rest == thread_id:
+			rest = ""
+		return f"/{rest}" if rest else "/"
+	return p
+
+
+def _parse_find_file_rows(output: str | None) -> list[_FileRow]:
+	"""Parse ``find -printf '%s|%T@|%p'`` rows, one per line (path last, so '|' in names is safe)."""
+	rows: list[_FileRow] = []
+	for size, mtime, file_path in _FIND_FILE_ROW_RE.findall(output or ""):
+		try:
+			modified_at = _utc_isoformat(int(float(mtime)))
+		except (ValueError, OverflowError, OSError):
+			modified_at = None
+		rows.append(_FileRow(file_path, int(size) if size else 0, modified_at))
+	return rows
+
+
+# Set while write/edit run BaseSandbox's implementation (which goes through execute): the caller schedules
+# its own incremental sync afterwards, so execute must not queue a full one for the helper command.
+_SUPPRESS_EXECUTE_SYNC: contextvars.ContextVar[bool] = contextvars.ContextVar("suppress_execute_sync", default=False)
+
+# Dedicated pool for the blocking E2B calls behind the async API, so sandbox I/O neither starves nor is
+# starved by other users of the event loop's default executor.
+_SANDBOX_IO_EXECUTOR = ThreadPoolExecutor(max_workers=32, thread_name_prefix="sandbox-io")
+
+_T = TypeVar("_T")
+
+
+async def _run_in_io_pool(func: Callable[..., _T], *args: Any) -> _T:
+	"""``asyncio.to_thread`` equivalent on ``_SANDBOX_IO_EXECUTOR`` (context vars propagated the same way)."""
+	loop = asyncio.get_running_loop()
+	ctx = contextvars.copy_context()
+	return await loop.run_in_executor(_SANDBOX_IO_EXECUTOR, functools.partial(ctx.run, func, *args))
+
+
+# Paths whose presence means the skills checkout is healthy (see _ensure_workspace_ready).
+_SKILLS_HEALTH_PATHS = (
+    f"{OPT_SOLVEN_SKILLS}/.git/HEAD",
+    f"{OPT_SOLVEN_SKILLS}/docx/SKILL.md",
+    f"{OPT_SOLVEN_SKILLS}/escrituras/SKILL.md",
+)
+
+
+@cache
+def _rclone_config_fingerprint() -> str:
+	"""SHA-256 of create_rclone_config.sh plus the S3 settings it is run with; both are fixed per process."""
+	b64 = _e2b_resource_b64("scripts", "create_rclone_config.sh")
+	return hashlib.sha256((b64 + json.dumps(_s3_config().sandbox_envs, sort_keys=True)).encode("utf-8")).hexdigest()
+
+
+def _download_chunks(paths: list[str]) -> list[list[str]]:
+	"""Split a download batch into reader calls of at most _DOWNLOAD_BATCH_SIZE paths."""
+	return [paths[i:i + _DOWNLOAD_BATCH_SIZE] for i in range(0, len(paths), _DOWNLOAD_BATCH_SIZE)]
+
+
+# git credential helper answering from the command's env (see _skills_git_envs), so the token is passed
+# per command and never written to the checkout's .git/config, which the agent can read at /.solven/skills.
+_SKILLS_GIT_CREDENTIAL_HELPER = (
+	'!f() { test "$1" = get && echo "username=$SKILLS_GIT_USERNAME" && echo "password=$SKILLS_GIT_TOKEN"; }; f'
+)
+
+
+def _skills_git() -> str:
+	"""``git`` invocation for the skills repo: with the env-reading credential helper when a token is set."""
+	if not (_s3_config().git_token or "").strip():
+		return "git"
+	return f"git -c credential.helper= -c credential.helper={shlex.quote(_SKILLS_GIT_CREDENTIAL_HELPER)}"
+
+
+def _skills_git_envs() -> dict[str, str]:
+	"""Per-command envs read by _SKILLS_GIT_CREDENTIAL_HELPER (empty when no token is configured)."""
+	cfg = _s3_config()
+	token = (cfg.git_token or "").strip()
+	if not token:
+		return {}
+	return {"SKILLS_GIT_USERNAME": cfg.git_username or "x-access-token", "SKILLS_GIT_TOKEN": token}
+
+
+def _skills_mount_dirs_cmd(mark_synced: bool = False) -> str:
+	"""Build the mkdir of the bwrap mount-point dirs inside /opt/solven/skills, optionally stamping the skills refresh time."""
+	cmd = (
+		f"mkdir -p {OPT_SOLVEN_SKILLS}/escrituras/assets/templates "
+		f"{OPT_SOLVEN_SKILLS}/escrituras/references 2>/dev/null || true"
+	)
+	if mark_synced:
+		cmd += f"; date +%s > {shlex.quote(_SKILLS_SYNC_STAMP)}"
+	return cmd
+
+
+def _is_document_path(path: str) -> bool:
+	"""Return True if ``path`` has a document extension (case-insensitive) that must go through markdown conversion."""
+	return os.path.splitext(path)[1].lower() in _READ_AS_DOCUMENT_EXTENSIONS
+
+
+def _join_output(stdout: str | None, stderr: str | None) -> str:
+	"""Combine command streams; returns stdout as-is (no copy) in the common empty-stderr case."""
+	if not stderr:
+		return stdout or ""
+	if not stdout:
+		return stderr
+	return stdout + stderr
+
+
+def _result_response(result: Any) -> ExecuteResponse:
+	"""ExecuteResponse for a finished E2B command (sync or async handle)."""
+	return ExecuteResponse(output=_join_output(result.stdout, result.stderr), exit_code=result.exit_code, truncated=False)
+
+
+def _exit_response(e: CommandExitException) -> ExecuteResponse:
+	"""ExecuteResponse for a non-zero exit: E2B raises instead of returning, but output and code are the command's."""
+	return ExecuteResponse(output=_join_output(e.stdout, e.stderr), exit_code=e.exit_code, truncated=False)
+
+
+def _execute_error_response(e: Exception) -> ExecuteResponse:
+	return ExecuteResponse(output=f"Error executing command: {str(e)}", exit_code=1, truncated=False)
+
+
 # Marker file written inside E2B workspace after full init; any new SandboxBackend instance can skip full setup if it exists.
 _WORKSPACE_READY_MARKER = ".workspace_ready"
 
 # Min seconds between S3→local rclone syncs on the fast init path (avoid hammering on every tool call).
 _HYDRATE_FROM_S3_THROTTLE_SEC = 45.0
 
+# ls_info / glob_info / grep_raw result cache: entries are dropped on every workspace mutation and expire after
+# the TTL (covers changes made outside this backend, e.g. background processes started by the agent).
+_SEARCH_CACHE_MAXSIZE = 256
+_SEARCH_CACHE_TTL_SEC = 30.0
+
+# Upper bound on lines returned by glob_info / grep_raw. `head` closes the pipe early, so find/rg stop
+# walking once the cap is hit and neither the sandbox nor this process buffers an unbounded stdout.
+_SEARCH_MAX_RESULTS = 5000
+# Per-file match cap in grep_raw so one huge file cannot fill the global budget on its own.
+_GREP_MAX_MATCHES_PER_FILE = 500
+# Line cap for the grep fallback (rg truncates via --max-columns): path + line number + a 512-char preview.
+_GREP_FALLBACK_MAX_LINE_CHARS = 1024
+
+# Max concurrent sandbox writes in aupload_files.
+_UPLOAD_CONCURRENCY = 16
+# download_files reads up to this many paths per sandbox exec, with at most _DOWNLOAD_CONCURRENCY execs in flight.
+_DOWNLOAD_BATCH_SIZE = 32
+_DOWNLOAD_CONCURRENCY = 8
+# Ceiling for the agent's own commands (execute / aexecute).
+_EXECUTE_TIMEOUT_SEC = 1200
+# Ceiling for the trusted read-only bwrap commands (ls / glob / grep / read / download). They finish in milliseconds;
+# the agent's own commands keep the long execute timeout.
+_READONLY_COMMAND_TIMEOUT_SEC = 120
+
+# Seconds after a successful skills pull/clone during which _ensure_skills_repo skips the git round-trip.
+# The stamp lives in the sandbox (shared by every thread on it), next to OPT_SOLVEN_SKILLS.
+_SKILLS_REFRESH_TTL_SEC = 3600
+_SKILLS_SYNC_STAMP = os.path.join(os.path.dirname(OPT_SOLVEN_SKILLS), ".skills_last_sync")
+
+# Seconds a successful skills health check stays valid (skip the files.exists probes on back-to-back tool calls).
+_WORKSPACE_HEALTH_CHECK_TTL_SEC = 60.0
+
+_E2B_SANDBOX_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "e2b_sandbox")
+
+
+@cache
+def _e2b_resource_b64(*parts: str) -> str:
+	"""Base64 of a file shipped under e2b_sandbox/ (scripts, manifests). Read from disk once per process."""
+	with open(os.path.join(_E2B_SANDBOX_DIR, *parts), "rb") as f:
+		return base64.b64encode(f.read()).decode("ascii")
+
+
+@dataclass(frozen=True)
+class _S3Config:
+	"""S3/git/E2B settings read from the host environment. Credentials do not change during the process lifetime."""
+
+	bucket: str
+	sandbox_envs: dict[str, str]
+	git_username: str | None
+	git_token: str | None
+	sandbox_timeout: int
+
+
+@cache
+def _s3_config() -> _S3Config:
+	"""Parse the host environment once (lazily, so ``.env`` loaded after import is still honoured)."""
+	envs: dict[str, str] = {}
+	for name in ("S3_ACCESS_KEY_ID", "S3_BUCKET_NAME", "S3_ENDPOINT_URL", "S3_REGION"):
+		val = (os.getenv(name) or "").strip()
+		if val:
+			envs[name] = val
+	secret = (os.getenv("S3_ACCESS_SECRET") or os.getenv("AWS_SECRET_ACCESS_KEY") or "").strip()
+	if secret:
+		envs["S3_ACCESS_SECRET"] = secret
+	return _S3Config(
+		bucket=(os.getenv("S3_BUCKET_NAME") or "solven-testing").strip(),
+		sandbox_envs=envs,
+		git_username=os.getenv("GIT_USERNAME"),
+		git_token=os.getenv("GIT_TOKEN"),
+		sandbox_timeout=int(os.getenv("E2B_SANDBOX_TIMEOUT", "300")),
+	)
+
 
 class SandboxBackend(BaseSandbox):
 	"""
@@ -98,8 +471,6 @@ class SandboxBackend(BaseSandbox):
 		self._runtime = runtime
 		self._sandbox: Optional[Sandbox] = None
 
-		from src.utils.config import get_user, get_workspace_id
-
 		workspace_id = get_workspace_id(runtime)
 		if not workspace_id:
 			raise RuntimeError("Cannot initialize SandboxBackend: thread_id not found in config")
@@ -119,19 +490,24 @@ class SandboxBackend(BaseSandbox):
 		self._workspace_ready = False
 		self._initialized = False
 		self._bwrap_available: Optional[bool] = None
+		self._workspace_verified_at = 0.0
+		self._last_hydrate_from_s3_monotonic = 0.0
+		# Serializes initialization so a background warm-up and the first tool call share one cold start.
+		self._init_lock = threading.RLock()
+		self._init_future: Future | None = None
+		self._init_future_lock = threading.Lock()
+		self._search_cache: OrderedDict[tuple, tuple[float, tuple]] = OrderedDict()
+		# Bumped by every invalidation: a search that started before it must not store its (stale) result.
+		self._search_cache_generation = 0
+		# Searches run on I/O pool threads concurrently: guards _search_cache, _missing_paths and the generation.
+		self._search_cache_lock = threading.Lock()
+		self._missing_paths: dict[str, float] = {}
 		self.runtime = runtime
 
 	def _s3_envs(self) -> dict[str, str]:
 		"""S3-related env vars from host for sandbox.commands.run(..., envs=). Ensures rclone/config see credentials."""
-		out: dict[str, str] = {}
-		for name in ("S3_ACCESS_KEY_ID", "S3_BUCKET_NAME", "S3_ENDPOINT_URL", "S3_REGION"):
-			val = (os.getenv(name) or "").strip()
-			if val:
-				out[name] = val
-		secret = (os.getenv("S3_ACCESS_SECRET") or os.getenv("AWS_SECRET_ACCESS_KEY") or "").strip()
-		if secret:
-			out["S3_ACCESS_SECRET"] = secret
-		return out
+		# The process-wide dict built once by ``_s3_config`` (no per-call copy): treat it as read-only.
+		return _s3_config().sandbox_envs
 
 	# Attachments are always stored under this subfolder in the workspace.
 	ADJUNTOS_DIR = "adjuntos"
@@ -156,27 +532,7 @@ class SandboxBackend(BaseSandbox):
 		``/workspaces/...`` (old layout), ``ls_info``/``scandir`` would look for nested dirs
 		that do not exist and return empty. This strips those prefixes.
 		"""
-		if not path or not path.strip():
-			return "/"
-		p = path.strip().replace("\\", "/")
-		if p in (".", "./"):
-			return "/"
-		if not p.startswith("/"):
-			p = "/" + p
-		p = p.rstrip("/") or "/"
-		prefix = f"/{self._tenant_id}/threads/{self._thread_id}"
-		if p == prefix or p.startswith(prefix + "/"):
-			rest = p[len(prefix) :].lstrip("/")
-			return f"/{rest}" if rest else "/"
-		# Legacy: /workspaces[/thread_id][/...]
-		if p == "/workspaces" or p.startswith("/workspaces/"):
-			rest = p[len("/workspaces") :].lstrip("/")
-			if rest.startswith(self._thread_id + "/"):
-				rest = rest[len(self._thread_id) + 1 :]
-			elif rest == self._thread_id:
-				rest = ""
-			return f"/{rest}" if rest else "/"
-		return p
+		return _normalize_agent_path(path, self._workspace, self._thread_id)
 
 	def _resolve_workspace_path(self, path: str) -> str:
 		"""
@@ -189,7 +545,8 @@ class SandboxBackend(BaseSandbox):
 		path = self._normalize_agent_path(path)
 		if not path or path.strip() in ("", "/"):
 			return self._workspace
-		p = path.strip().replace("\\", "/").lstrip("/")
+		# Already normalized above (backslashes converted), so only the leading slash needs trimming.
+		p = path.strip().lstrip("/")
 		ws = self._workspace.rstrip("/")
 		resolved = os.path.normpath(f"{ws}/{p}")
 		if resolved != ws and not resolved.startswith(ws + os.sep):
@@ -220,14 +577,21 @@ class SandboxBackend(BaseSandbox):
 			return self._sandbox.sandbox_id
 		return f"sandbox-{self._thread_id}"
 
-	def _get_or_create_user_sandbox(self) -> None:
-		"""Get existing sandbox for this user (RUNNING or PAUSED) or create one. Reuses same sandbox via process cache and deterministic pick."""
+	def _get_or_create_user_sandbox(self) -> bool:
+		"""Get existing sandbox for this user (RUNNING or PAUSED) or create one; True when it was just created."""
+		# Reuses the same sandbox via the process cache and a deterministic pick. A new sandbox has nothing set up in it yet.
 		user_key = str(self._user_id)
 
+		handle = _user_sandbox_handles.get(user_key)
+		if handle is not None and _time.monotonic() - handle[1] < _SANDBOX_HANDLE_TTL_SEC:
+			self._sandbox = handle[0]
+			return False
+
 		def try_connect(sandbox_id: str) -> bool:
 			try:
 				self._sandbox = Sandbox.connect(sandbox_id)
 				_user_sandbox_cache[user_key] = sandbox_id
+				_user_sandbox_handles[user_key] = (self._sandbox, _time.monotonic())
 				return True
 			except Exception:
 				self._sandbox = None
@@ -235,7 +599,7 @@ class SandboxBackend(BaseSandbox):
 
 		cached_id = _user_sandbox_cache.get(user_key)
 		if cached_id and try_connect(cached_id):
-			return
+			return False
 		if cached_id:
 			_user_sandbox_cache.pop(user_key, None)
 
@@ -256,51 +620,50 @@ class SandboxBackend(BaseSandbox):
 			ids_to_try = [cached_id] + [i for i in ids_sorted if i != cached_id]
 		else:
 			ids_to_try = ids_sorted
+		# The cached id was just tried above: the first pass goes straight to the others.
 		for sandbox_id in ids_to_try:
-			if try_connect(sandbox_id):
-				return
+			if sandbox_id != cached_id and try_connect(sandbox_id):
+				return False
 
 		if existing_sandboxes:
-			_time.sleep(2)
-			for sandbox_id in ids_to_try:
-				if try_connect(sandbox_id):
-					return
-
-		env_vars = {"THREAD_ID": self._thread_id, "USER_ID": user_key}
-		for key, env in [
-			("S3_BUCKET_NAME", "S3_BUCKET_NAME"),
-			("S3_ACCESS_KEY_ID", "S3_ACCESS_KEY_ID"),
-			("S3_ACCESS_SECRET", "S3_ACCESS_SECRET"),
-			("S3_ENDPOINT_URL", "S3_ENDPOINT_URL"),
-			("S3_REGION", "S3_REGION"),
-		]:
-			if val := os.getenv(env):
-				env_vars[key] = val
-
-		timeout_sec = int(os.getenv("E2B_SANDBOX_TIMEOUT", "300"))
+			# A sandbox that is mid-resume usually accepts connections well before a fixed 2s wait would end:
+			# retry on a short backoff instead (same worst-case budget).
+			for delay in _SANDBOX_RECONNECT_BACKOFF_SEC:
+				_time.sleep(delay)
+				for sandbox_id in ids_to_try:
+					if try_connect(sandbox_id):
+						return False
+
+		cfg = _s3_config()
+		env_vars = {"THREAD_ID": self._thread_id, "USER_ID": user_key, **cfg.sandbox_envs}
 		self._sandbox = Sandbox.create(
 			template=SANDBOX_TEMPLATE,
 			envs=env_vars,
-			timeout=timeout_sec,
+			timeout=cfg.sandbox_timeout,
 			lifecycle={"on_timeout": "pause", "auto_resume": True},
 			metadata={"userId": user_key},
 		)
 		_user_sandbox_cache[user_key] = self._sandbox.sandbox_id
+		_user_sandbox_handles[user_key] = (self._sandbox, _time.monotonic())
+		return True
 
-	def _ensure_boot_dirs(self) -> None:
-		"""Create layout (idempotent): workspace, .venv, node_modules, /opt/solven/skills, user-models, locks, rclone cache."""
-		cache_dir = f"{RCLONE_CACHE_BASE}/{self._thread_id}"
-		self._sandbox.commands.run(
+	@cached_property
+	def _boot_dirs_cmd(self) -> str:
+		"""Shell mkdir for the layout: workspace, .venv, node_modules, /opt/solven/skills, user-models, locks, rclone config."""
+		return (
 			f"mkdir -p {shlex.quote(self._workspace)} {shlex.quote(self._venv)} {shlex.quote(self._node_modules)} "
 			f"{shlex.quote(OPT_SOLVEN_SKILLS)} "
 			f"{OPT_SOLVEN_USER_MODELS}/templates {OPT_SOLVEN_USER_MODELS}/references "
 			# templates/normalized: stub inside the ro-bind source so bwrap can overlay it without mkdir-ing into ro fs
 			f"{OPT_SOLVEN_USER_MODELS}/templates/normalized {shlex.quote(OPT_SOLVEN_USER_MODELS_NORMALIZED)} "
-			f"{shlex.quote(SOLVEN_LOCKS)} {shlex.quote(RCLONE_CACHE_BASE)} {shlex.quote(cache_dir)} "
-			f"/root/.config/rclone",
-			timeout=10, user="root",
+			f"{shlex.quote(SOLVEN_LOCKS)} "
+			f"/root/.config/rclone"
 		)
 
+	def _ensure_boot_dirs(self) -> None:
+		"""Create layout (idempotent). Full init gets this from ``_configure_rclone``; used standalone by repairs."""
+		self._sandbox.commands.run(self._boot_dirs_cmd, timeout=10, user="root")
+
 	def _hydrate_from_s3(self, copy_only: bool = False) -> None:
 		"""Pull latest thread workspace from S3 into workspace/.
 
@@ -312,20 +675,18 @@ class SandboxBackend(BaseSandbox):
 		When ``copy_only=False`` (initial full hydration on a fresh sandbox), ``rclone sync`` is
 		used to guarantee the workspace exactly mirrors S3.
 		"""
-		bucket = (os.getenv("S3_BUCKET_NAME") or "solven-testing").strip()
-		remote = f"s3remote:{bucket}/{self._tenant_id}/threads/{self._thread_id}"
-		excludes = "--exclude '.solven/**' --exclude '.venv/**' --exclude 'node_modules/**' --exclude '.bun/**' --exclude '.git/**'"
 		rclone_op = "copy" if copy_only else "sync"
+		flags = _RCLONE_FLAGS if copy_only else _RCLONE_BULK_FLAGS
 		cmd = (
-			f"rclone {rclone_op} {shlex.quote(remote)}/ {shlex.quote(self._workspace)}/ "
-			f"--config /root/.config/rclone/rclone.conf "
-			f"--fast-list --transfers 4 --no-update-modtime {excludes} "
+			f"rclone {rclone_op} {shlex.quote(self._thread_s3_remote)}/ {shlex.quote(self._workspace)}/ "
+			f"{flags} {_RCLONE_WORKSPACE_EXCLUDES} "
 			f"2>/dev/null || true"
 		)
 		try:
 			self._sandbox.commands.run(cmd, timeout=120, user="root", envs=self._s3_envs())
 		except Exception as e:
 			logging.warning("_hydrate_from_s3: %s", e)
+		self.invalidate_search_cache()
 
 	def _maybe_hydrate_from_s3_throttled(self) -> None:
 		"""On repeated tool runs, periodically pull S3 so uploads from the app (cold storage) appear in the sandbox.
@@ -336,8 +697,7 @@ class SandboxBackend(BaseSandbox):
 		if not self._sandbox or not getattr(self, "_workspace_ready", False):
 			return
 		now = _time.monotonic()
-		last = getattr(self, "_last_hydrate_from_s3_monotonic", 0.0)
-		if now - last < _HYDRATE_FROM_S3_THROTTLE_SEC:
+		if now - self._last_hydrate_from_s3_monotonic < _HYDRATE_FROM_S3_THROTTLE_SEC:
 			return
 		self._last_hydrate_from_s3_monotonic = now
 		try:
@@ -345,38 +705,53 @@ class SandboxBackend(BaseSandbox):
 		except Exception as e:
 			logging.warning("_maybe_hydrate_from_s3_throttled: %s", e)
 
-	def _ensure_skills_mount_dirs(self) -> None:
+	def _paths_exist(self, *paths: str) -> list[bool]:
+		"""Existence of several sandbox paths (outside bwrap) in a single command instead of one files.exists RPC each."""
+		quoted = " ".join(shlex.quote(p) for p in paths)
+		result = self._sandbox.commands.run(
+			f"for p in {quoted}; do [ -e \"$p\" ] && echo 1 || echo 0; done",
+			timeout=10, user="root",
+		)
+		flags = (result.stdout or "").split()
+		return [i < len(flags) and flags[i] == "1" for i in range(len(paths))]
+
+	def _ensure_skills_mount_dirs(self, mark_synced: bool = False) -> None:
 		"""Ensure bwrap mount-point dirs exist inside /opt/solven/skills (for user-models sub-binds)."""
+		# With mark_synced=True the skills refresh stamp is written in the same command.
 		try:
-			self._sandbox.commands.run(
-				f"mkdir -p {OPT_SOLVEN_SKILLS}/escrituras/assets/templates "
-				f"{OPT_SOLVEN_SKILLS}/escrituras/references 2>/dev/null || true",
-				timeout=10, user="root",
-			)
+			self._sandbox.commands.run(_skills_mount_dirs_cmd(mark_synced), timeout=10, user="root")
 		except Exception as e:
 			logging.warning("_ensure_skills_mount_dirs: %s", e)
 
 	def _log_skills_filesystem_state(self, phase: str) -> None:
 		"""Diagnostics for E2B dashboard confusion: git clone targets ``/opt/solven/skills``, not ``{workspace}/.solven/skills``."""
-		if not self._sandbox:
+		# Probes are only issued for the log levels that are enabled, so with INFO off this costs a single
+		# existence probe (and none at all when warnings are silenced).
+		logger = logging.getLogger()
+		if not self._sandbox or not logger.isEnabledFor(logging.WARNING):
 			return
 		ws_dot_solven_skills = f"{self._workspace}/.solven/skills"
 		try:
-			ws_skills_exists = self._sandbox.files.exists(ws_dot_solven_skills)
-			opt_git = self._sandbox.files.exists(f"{OPT_SOLVEN_SKILLS}/.git/HEAD")
-			opt_docx = self._sandbox.files.exists(f"{OPT_SOLVEN_SKILLS}/docx/SKILL.md")
-			opt_esc = self._sandbox.files.exists(f"{OPT_SOLVEN_SKILLS}/escrituras/SKILL.md")
-			logging.info(
-				"[skills_fs] %s | workspace=%s | %s exists=%s (expected empty/absent; not git clone) | "
-				"/opt/solven/skills: .git=%s docx/SKILL.md=%s escrituras/SKILL.md=%s",
-				phase,
-				self._workspace,
-				ws_dot_solven_skills,
-				ws_skills_exists,
-				opt_git,
-				opt_docx,
-				opt_esc,
-			)
+			if logger.isEnabledFor(logging.INFO):
+				opt_git, ws_skills_exists, opt_docx, opt_esc = self._paths_exist(
+					f"{OPT_SOLVEN_SKILLS}/.git/HEAD",
+					ws_dot_solven_skills,
+					f"{OPT_SOLVEN_SKILLS}/docx/SKILL.md",
+					f"{OPT_SOLVEN_SKILLS}/escrituras/SKILL.md",
+				)
+				logging.info(
+					"[skills_fs] %s | workspace=%s | %s exists=%s (expected empty/absent; not git clone) | "
+					"/opt/solven/skills: .git=%s docx/SKILL.md=%s escrituras/SKILL.md=%s",
+					phase,
+					self._workspace,
+					ws_dot_solven_skills,
+					ws_skills_exists,
+					opt_git,
+					opt_docx,
+					opt_esc,
+				)
+			else:
+				(opt_git,) = self._paths_exist(f"{OPT_SOLVEN_SKILLS}/.git/HEAD")
 			if not opt_git:
 				r = self._sandbox.commands.run(
 					f"ls -la {shlex.quote(OPT_SOLVEN_SKILLS)} 2>&1 | head -40",
@@ -393,147 +768,164 @@ class SandboxBackend(BaseSandbox):
 		except Exception as e:
 			logging.warning("[skills_fs] %s probe failed: %s", phase, e)
 
-	def _ensure_skills_repo(self) -> None:
-		"""Ensure /opt/solven/skills has the skills git clone. Update in-place (pull or fetch+reset) when repo exists. Fresh clone directly into path (no temp dir)."""
+	def _skills_repo_state(self) -> str:
+		"""One round-trip: register safe.directory and report MISSING (no .git), FRESH (pulled within TTL) or STALE."""
+		stamp = shlex.quote(_SKILLS_SYNC_STAMP)
+		r = self._sandbox.commands.run(
+			f"git config --global --add safe.directory {shlex.quote(OPT_SOLVEN_SKILLS)} 2>/dev/null; "
+			f"if [ ! -f {shlex.quote(OPT_SOLVEN_SKILLS)}/.git/HEAD ]; then echo MISSING; "
+			f"else ts=$(cat {stamp} 2>/dev/null | tr -cd 0-9); "
+			f"if [ $(( $(date +%s) - ${{ts:-0}} )) -lt {_SKILLS_REFRESH_TTL_SEC} ]; then echo FRESH; else echo STALE; fi; fi",
+			timeout=5, user="root",
+		)
+		return (r.stdout or "").strip() or "STALE"
+
+	def _fetch_reset_skills_cmd(self) -> str:
+		"""Shell command: shallow-fetch SKILLS_REPO_REF and hard-reset onto it (run with _skills_git_envs)."""
+		# Not git pull: never deepens the shallow clone or merges, and only changed files get new mtimes.
+		# origin is (re)set to the plain URL, which also scrubs tokens older checkouts stored in .git/config.
+		repo = shlex.quote(OPT_SOLVEN_SKILLS)
+		return (
+			f"git -C {repo} remote set-url origin {shlex.quote(SKILLS_REPO_URL)} && "
+			f"{_skills_git()} -C {repo} fetch --depth=1 origin {shlex.quote(SKILLS_REPO_REF)} && "
+			f"git -C {repo} reset --hard FETCH_HEAD && "
+			f"git -C {repo} clean -fdq"
+		)
+
+	def _refresh_skills_repo_in_background(self) -> None:
+		"""Fire-and-forget fetch+reset of a stale checkout; the existing one keeps serving meanwhile."""
+		# flock -n drops the refresh when another thread's is already running. Mount dirs (removed by git clean)
+		# and the refresh stamp are restored by the same background command.
+		lock = shlex.quote(f"{SOLVEN_LOCKS}/skills-refresh")
+		refresh = f"{self._fetch_reset_skills_cmd()} && {_skills_mount_dirs_cmd(mark_synced=True)}"
 		try:
 			self._sandbox.commands.run(
-				f"git config --global --add safe.directory {shlex.quote(OPT_SOLVEN_SKILLS)} 2>/dev/null || true",
-				timeout=5, user="root",
+				f"flock -n {lock} sh -c {shlex.quote(refresh)} >/dev/null 2>&1",
+				background=True, user="root", envs=_skills_git_envs(),
+			).disconnect()
+			logging.info("[skills_repo] stale checkout, refreshing in background")
+		except Exception as e:
+			logging.warning("_ensure_skills_repo background refresh: %s", e)
+
+	def _fetch_reset_skills_repo(self) -> bool:
+		"""Run ``_fetch_reset_skills_cmd`` and wait for it; True on success."""
+		try:
+			r = self._sandbox.commands.run(
+				self._fetch_reset_skills_cmd(), timeout=60, user="root", envs=_skills_git_envs(),
 			)
-			has_git = self._sandbox.files.exists(f"{OPT_SOLVEN_SKILLS}/.git/HEAD")
+		except Exception as e:
+			logging.warning("_ensure_skills_repo fetch+reset: %s", e)
+			return False
+		if r.exit_code == 0:
+			logging.info("[skills_repo] fetch+reset ok for %s at %s", OPT_SOLVEN_SKILLS, SKILLS_REPO_REF)
+			return True
+		logging.warning(
+			"[skills_repo] fetch+reset exit=%s stdout=%s stderr=%s",
+			r.exit_code,
+			(r.stdout or "")[:800],
+			(r.stderr or "")[:800],
+		)
+		return False
+
+	def _ensure_skills_repo(self, force: bool = False) -> None:
+		"""Ensure /opt/solven/skills has the skills git clone. Update in-place (shallow fetch+reset) when repo exists. Fresh clone directly into path (no temp dir)."""
+		# A repo pulled less than _SKILLS_REFRESH_TTL_SEC ago is left alone unless force=True (used by repair paths).
+		# An older one is refreshed in the background; only a missing clone (or force) blocks.
+		try:
+			state = self._skills_repo_state()
+			has_git = state != "MISSING"
 			logging.info(
-				"[skills_repo] start has_.git=%s repo_url=%s git_token_set=%s",
-				has_git,
+				"[skills_repo] start state=%s repo_url=%s git_token_set=%s",
+				state,
 				SKILLS_REPO_URL,
-				bool((os.getenv("GIT_TOKEN") or "").strip()),
+				bool((_s3_config().git_token or "").strip()),
 			)
+			if state == "FRESH" and not force:
+				return
+			if has_git and not force:
+				self._refresh_skills_repo_in_background()
+				return
 			if has_git:
-				# Repo exists. Try to update in-place.
-				try:
-					self._sandbox.git.pull(
-						path=OPT_SOLVEN_SKILLS,
-						username=os.getenv("GIT_USERNAME"),
-						password=os.getenv("GIT_TOKEN"),
-						user="root",
-						timeout=60,
-					)
-					logging.info("[skills_repo] git pull completed for %s", OPT_SOLVEN_SKILLS)
-					self._ensure_skills_mount_dirs()
-					return
-				except Exception as e:
-					logging.warning("_ensure_skills_repo git pull: %s", e)
-				try:
-					token = os.getenv("GIT_TOKEN") or ""
-					username_git = os.getenv("GIT_USERNAME") or ""
-					auth_url = SKILLS_REPO_URL.replace("https://", f"https://{username_git}:{token}@") if token else SKILLS_REPO_URL
-					r = self._sandbox.commands.run(
-						f"git -C {shlex.quote(OPT_SOLVEN_SKILLS)} remote set-url origin {shlex.quote(auth_url)} && "
-						f"git -C {shlex.quote(OPT_SOLVEN_SKILLS)} fetch --depth=1 origin main && "
-						f"git -C {shlex.quote(OPT_SOLVEN_SKILLS)} reset --hard origin/main",
-						timeout=60, user="root",
-					)
-					if r.exit_code == 0:
-						logging.info("[skills_repo] fetch+reset ok for %s", OPT_SOLVEN_SKILLS)
-						self._ensure_skills_mount_dirs()
-						return
-					logging.warning(
-						"[skills_repo] fetch+reset exit=%s stdout=%s stderr=%s",
-						r.exit_code,
-						(r.stdout or "")[:800],
-						(r.stderr or "")[:800],
-					)
-				except Exception as e:
-					logging.warning("_ensure_skills_repo fetch+reset: %s", e)
+				# Repo exists: update in-place to the tip of SKILLS_REPO_REF.
+				if self._fetch_reset_skills_repo():
+					self._ensure_skills_mount_dirs(mark_synced=True)
 				return
 
 			# No repo: remove existing dir and clone directly into OPT_SOLVEN_SKILLS (no temp dir).
 			logging.info("[skills_repo] no .git at %s — cloning", OPT_SOLVEN_SKILLS)
-			self._sandbox.commands.run(
-				f"rm -rf {shlex.quote(OPT_SOLVEN_SKILLS)}",
-				timeout=15, user="root",
-			)
-			self._sandbox.commands.run(
-				f"mkdir -p {shlex.quote(OPT_SOLVEN_SKILLS)} {shlex.quote(os.path.dirname(OPT_SOLVEN_SKILLS))}",
-				timeout=5, user="root",
-			)
+			# Wipe, clone, pin the ref, create mount dirs and stamp in one round-trip. Credentials come from the
+			# per-command credential helper, so origin is the plain URL and no token is stored in .git/config.
+			# --branch takes SKILLS_REPO_REF straight from the clone (branch or tag, no tags or other refs); a bare
+			# commit id cannot be cloned that way, so that case falls back to a default clone plus fetch+reset.
+			repo = shlex.quote(OPT_SOLVEN_SKILLS)
+			git = _skills_git()
+			url = shlex.quote(SKILLS_REPO_URL)
+			clone = f"{git} clone --quiet --depth=1 --no-tags --branch {shlex.quote(SKILLS_REPO_REF)} {url} {repo}"
+			fallback = f"rm -rf {repo} && {git} clone --quiet --depth=1 {url} {repo} && {self._fetch_reset_skills_cmd()}"
+			steps = [
+				f"rm -rf {repo}",
+				f"mkdir -p {repo}",
+				f"{{ {clone} 2>/dev/null || {{ {fallback}; }}; }}",
+				_skills_mount_dirs_cmd(mark_synced=True),
+			]
 			try:
-				self._sandbox.git.clone(
-					SKILLS_REPO_URL,
-					path=OPT_SOLVEN_SKILLS,
-					username=os.getenv("GIT_USERNAME"),
-					password=os.getenv("GIT_TOKEN"),
-					depth=1,
-					user="root",
-					timeout=120,
+				self._sandbox.commands.run(
+					# On failure keep an empty dir so bwrap can still bind /.solven/skills.
+					f"{{ {' && '.join(steps)}; }} || {{ mkdir -p {repo}; exit 1; }}",
+					timeout=150, user="root", envs=_skills_git_envs(),
 				)
 				logging.info("[skills_repo] git clone completed into %s", OPT_SOLVEN_SKILLS)
 			except Exception as e:
 				msg = getattr(e, "stderr", None) or getattr(e, "stdout", None) or str(e)
-				# Don't raise: keep the empty dir so bwrap can still bind /.solven/skills.
+				# Don't raise: skills are unavailable but the workspace still works.
 				logging.warning("_ensure_skills_repo clone failed (skills unavailable): %s", msg)
-				return
-			self._ensure_skills_mount_dirs()
 		finally:
 			self._log_skills_filesystem_state("_ensure_skills_repo")
 
 	def _pull_user_models(self) -> None:
 		"""Copy user-specific templates, templates/normalized, and references from S3:users/{id}/models/ into /opt/solven/user-models. Fast; idempotent."""
-		bucket = (os.getenv("S3_BUCKET_NAME") or "solven-testing").strip()
+		bucket = _s3_config().bucket
 		s3_user_base = f"s3remote:{bucket}/{self._tenant_id}/users/{self._user_id}/models"
 		templates_dst = f"{OPT_SOLVEN_USER_MODELS}/templates"
 		references_dst = f"{OPT_SOLVEN_USER_MODELS}/references"
-		cfg = "--config /root/.config/rclone/rclone.conf --fast-list --transfers 4 --no-update-modtime"
+		# templates/normalized stub must live inside templates/ so bwrap can overlay it without touching the ro-bind filesystem
+		mkdirs = (
+			f"mkdir -p {shlex.quote(templates_dst)} {shlex.quote(references_dst)} "
+			f"{OPT_SOLVEN_USER_MODELS}/templates/normalized {shlex.quote(OPT_SOLVEN_USER_MODELS_NORMALIZED)}"
+		)
+		# The three copies are independent: run them concurrently in one command (wall time = slowest copy).
+		copies = " & ".join(
+			f"{{ rclone copy {shlex.quote(src)}/ {shlex.quote(dst)}/ {_RCLONE_FLAGS} 2>/dev/null || true; }}"
+			for src, dst in [
+				(f"{s3_user_base}/templates", templates_dst),
+				(f"{s3_user_base}/references", references_dst),
+				(f"{s3_user_base}/templates/normalized", OPT_SOLVEN_USER_MODELS_NORMALIZED),
+			]
+		)
 		try:
 			self._sandbox.commands.run(
-				# templates/normalized stub must live inside templates/ so bwrap can overlay it without touching the ro-bind filesystem
-				f"mkdir -p {shlex.quote(templates_dst)} {shlex.quote(references_dst)} "
-				f"{OPT_SOLVEN_USER_MODELS}/templates/normalized {shlex.quote(OPT_SOLVEN_USER_MODELS_NORMALIZED)}",
-				timeout=10, user="root",
+				f"{mkdirs} 2>/dev/null; {copies} & wait",
+				timeout=60, user="root", envs=self._s3_envs(),
 			)
 		except Exception as e:
-			logging.warning("_pull_user_models mkdir: %s", e)
-		for src, dst in [
-			(f"{s3_user_base}/templates", templates_dst),
-			(f"{s3_user_base}/references", references_dst),
-			(f"{s3_user_base}/templates/normalized", OPT_SOLVEN_USER_MODELS_NORMALIZED),
-		]:
-			try:
-				self._sandbox.commands.run(
-					f"rclone copy {shlex.quote(src)}/ {shlex.quote(dst)}/ {cfg} 2>/dev/null || true",
-					timeout=60, user="root", envs=self._s3_envs(),
-				)
-			except Exception as e:
-				logging.warning("_pull_user_models copy %s: %s", src, e)
+			logging.warning("_pull_user_models copy: %s", e)
 
 	def _ensure_thread_env(self) -> None:
 		"""Create .venv and node_modules inside workspace only when missing. Excluded from rclone sync."""
 		venv_python = f"{self._venv}/bin/python"
-		resources_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "e2b_sandbox", "resources")
 		pkg_path = f"{self._workspace}/package.json"
 		py_path = f"{self._workspace}/pyproject.toml"
-		# Skip if env already exists
-		try:
-			if self._sandbox.files.exists(venv_python):
-				return
-		except Exception as e:
-			logging.warning("_ensure_thread_env exists check: %s", e)
-		# Write default manifests only if not present
-		if not self._sandbox.files.exists(pkg_path):
-			with open(os.path.join(resources_dir, "package.json"), "r") as f:
-				pkg_content = f.read()
-			b64 = base64.b64encode(pkg_content.encode("utf-8")).decode("ascii")
-			self._sandbox.commands.run(
-				f"echo {shlex.quote(b64)} | base64 -d > {shlex.quote(pkg_path)}",
-				timeout=15, user="root",
-			)
-		if not self._sandbox.files.exists(py_path):
-			with open(os.path.join(resources_dir, "pyproject.toml"), "r") as f:
-				py_content = f.read()
-			b64 = base64.b64encode(py_content.encode("utf-8")).decode("ascii")
-			self._sandbox.commands.run(
-				f"echo {shlex.quote(b64)} | base64 -d > {shlex.quote(py_path)}",
-				timeout=15, user="root",
-			)
+		# One round-trip: skip if the env already exists, otherwise write default manifests that are not present
+		writes = []
+		for filename, dst in (("package.json", pkg_path), ("pyproject.toml", py_path)):
+			b64 = _e2b_resource_b64("resources", filename)
+			writes.append(f"{{ [ -e {shlex.quote(dst)} ] || {{ echo {shlex.quote(b64)} | base64 -d > {shlex.quote(dst)}; }}; }}")
+		r = self._sandbox.commands.run(
+			f"if [ -e {shlex.quote(venv_python)} ]; then echo READY; else {' && '.join(writes)}; fi",
+			timeout=15, user="root",
+		)
+		if (r.stdout or "").strip() == "READY":
+			return
 		try:
 			self._sandbox.commands.run(
 				f"cd {shlex.quote(self._workspace)} && uv sync",
@@ -549,24 +941,26 @@ class SandboxBackend(BaseSandbox):
 		except Exception as e:
 			logging.warning("_ensure_thread_env bun install: %s", e)
 
-	def _ensure_workspace_ready(self) -> None:
+	def _ensure_workspace_ready(self, skills_probe: list[bool] | None = None) -> None:
 		"""Health check called on every tool invocation when already initialized.
 		Repairs skills dir if it disappeared (e.g. sandbox resumed from stale snapshot).
 		Also repairs partial trees: .git present but expected SKILL.md files missing.
+
+		``skills_probe`` is a ``_paths_exist`` result for ``_SKILLS_HEALTH_PATHS`` the caller already has.
 		"""
 		if not self._sandbox or not getattr(self, "_workspace_ready", False):
 			return
+		if _time.monotonic() - self._workspace_verified_at < _WORKSPACE_HEALTH_CHECK_TTL_SEC:
+			return
 		try:
-			git_ok = self._sandbox.files.exists(f"{OPT_SOLVEN_SKILLS}/.git/HEAD")
-			docx_ok = self._sandbox.files.exists(f"{OPT_SOLVEN_SKILLS}/docx/SKILL.md")
-			esc_ok = self._sandbox.files.exists(f"{OPT_SOLVEN_SKILLS}/escrituras/SKILL.md")
+			git_ok, docx_ok, esc_ok = skills_probe or self._paths_exist(*_SKILLS_HEALTH_PATHS)
 			if not git_ok:
 				logging.warning(
 					"_ensure_workspace_ready: %s/.git/HEAD missing — re-running skills clone",
 					OPT_SOLVEN_SKILLS,
 				)
 				self._ensure_boot_dirs()
-				self._ensure_skills_repo()
+				self._ensure_skills_repo(force=True)
 			elif not docx_ok or not esc_ok:
 				logging.warning(
 					"_ensure_workspace_ready: expected skills missing under %s (docx=%s escrituras=%s) — re-running skills clone",
@@ -575,20 +969,33 @@ class SandboxBackend(BaseSandbox):
 					esc_ok,
 				)
 				self._ensure_boot_dirs()
-				self._ensure_skills_repo()
+				self._ensure_skills_repo(force=True)
+			self._workspace_verified_at = _time.monotonic()
 		except Exception as e:
 			logging.warning("_ensure_workspace_ready: %s", e)
 
 	def _ensure_initialized(self) -> None:
 		"""Ensure sandbox and thread workspace are initialized (idempotent).
 
-		Fast path: if _initialized is True, does a lightweight workspace health check and returns.
-		When a cached instance is reused across tool calls this is the path taken — no E2B API calls.
-
-		If the sandbox connection becomes stale (sandbox died while the instance was cached), the
-		health check will notice and set _initialized=False so the next call does a full reconnect.
+		Runs under ``_init_lock``: when ``start_initialization`` already has a cold start in flight, callers
+		wait for it instead of racing a second one.
 		"""
+		with self._init_lock:
+			self._initialize()
+
+	def _initialize(self) -> None:
+		"""Body of ``_ensure_initialized``; call with ``_init_lock`` held."""
+		# Fast path: if _initialized is True, a lightweight workspace health check and return (no E2B API calls),
+		# which is what a cached instance reused across tool calls takes. A stale connection (sandbox died while
+		# cached) fails the health check, which clears _initialized so the next call does a full reconnect.
 		if self._initialized:
+			# Hot path for back-to-back tool calls: neither the health check nor the hydrate is due yet.
+			now = _time.monotonic()
+			if (
+				now - self._workspace_verified_at < _WORKSPACE_HEALTH_CHECK_TTL_SEC
+				and now - self._last_hydrate_from_s3_monotonic < _HYDRATE_FROM_S3_THROTTLE_SEC
+			):
+				return
 			# Verify the live sandbox connection is still usable; reset if stale.
 			try:
 				self._ensure_workspace_ready()
@@ -596,22 +1003,27 @@ class SandboxBackend(BaseSandbox):
 				logging.warning("[ensure_initialized] sandbox health check failed, will reconnect: %s", e)
 				self._initialized = False
 				self._workspace_ready = False
+				self._workspace_verified_at = 0.0
 				self._sandbox = None
+				_user_sandbox_handles.pop(str(self._user_id), None)
 			else:
 				self._maybe_hydrate_from_s3_throttled()
 				return
 
 		# Connect or resume the per-user E2B sandbox (fast: ~1s API call)
-		self._get_or_create_user_sandbox()
+		fresh_sandbox = self._get_or_create_user_sandbox()
 
-		# Fast path: workspace was already set up in a previous run (marker lives inside E2B sandbox)
+		# Fast path: workspace was already set up in a previous run (marker lives inside E2B sandbox).
+		# A sandbox created just now cannot have it, so skip the probe.
 		marker = f"{self._workspace}/{_WORKSPACE_READY_MARKER}"
 		try:
-			if self._sandbox.files.exists(marker):
+			# The marker and the skills health check are probed together: one round-trip instead of two.
+			probe = [] if fresh_sandbox else self._paths_exist(marker, *_SKILLS_HEALTH_PATHS)
+			if probe and probe[0]:
 				self._pull_user_models()
 				self._workspace_ready = True
 				self._initialized = True
-				self._ensure_workspace_ready()
+				self._ensure_workspace_ready(skills_probe=probe[1:])
 				self._log_skills_filesystem_state("init_fast_path_marker_exists")
 				self._maybe_hydrate_from_s3_throttled()
 				return
@@ -620,71 +1032,204 @@ class SandboxBackend(BaseSandbox):
 
 		# Full first-time setup
 		logging.info("Preparando espacio de trabajo...")
-		self._ensure_boot_dirs()
 		self._configure_rclone()
-		self._hydrate_from_s3()
-		self._ensure_skills_repo()
-		self._pull_user_models()
-		try:
-			self._ensure_thread_env()
-		except Exception as e:
-			logging.warning("_ensure_thread_env at init: %s", e)
-		self._sandbox.commands.run(f"chown -R user:user {shlex.quote(self._workspace)}", timeout=60, user="root")
-		try:
-			if not self._sandbox.files.exists(f"{OPT_SOLVEN_SKILLS}/escrituras/SKILL.md"):
-				logging.warning("%s/escrituras/SKILL.md not found after init — skills may be unavailable", OPT_SOLVEN_SKILLS)
-		except Exception as e:
-			logging.warning("skills marker check after init: %s", e)
+		# The skills checkout (git) and the user-models pull (/opt/solven/user-models) touch neither the workspace
+		# nor each other: run both alongside the workspace steps and only join before the workspace is declared
+		# ready. The thread env stays after the hydrate, whose rclone sync would otherwise race its manifests.
+		# Own pool: we may already be on _SANDBOX_IO_EXECUTOR.
+		with ThreadPoolExecutor(max_workers=2) as init_pool:
+			side_steps = [
+				init_pool.submit(contextvars.copy_context().run, step)
+				for step in (self._ensure_skills_repo, self._pull_user_models)
+			]
+			self._hydrate_from_s3()
+			try:
+				self._ensure_thread_env()
+			except Exception as e:
+				logging.warning("_ensure_thread_env at init: %s", e)
+			for done in side_steps:
+				done.result()
+		# chown, the skills check, the bwrap probe and the ready marker share one round-trip
+		r = self._sandbox.commands.run(
+			f"chown -R user:user {shlex.quote(self._workspace)}; "
+			f"[ -e {shlex.quote(OPT_SOLVEN_SKILLS)}/escrituras/SKILL.md ] && echo SKILLS_OK || echo SKILLS_MISSING; "
+			"command -v bwrap >/dev/null && echo BWRAP_OK; "
+			f"echo ready > {shlex.quote(marker)} || echo MARKER_FAILED",
+			timeout=60, user="root",
+		)
+		out = r.stdout or ""
+		if "SKILLS_MISSING" in out:
+			logging.warning("%s/escrituras/SKILL.md not found after init — skills may be unavailable", OPT_SOLVEN_SKILLS)
+		if "MARKER_FAILED" in out:
+			logging.warning("Could not write workspace marker: %s", r.stderr)
+		if self._bwrap_available is None:
+			self._bwrap_available = "BWRAP_OK" in out
 		self._log_skills_filesystem_state("after_full_init")
 		self._workspace_ready = True
-		self._ensure_bwrap()
 		self._initialized = True
-		try:
-			self._sandbox.files.write(marker, "ready")
-		except Exception as e:
-			logging.warning("Could not write workspace marker: %s", e)
 		logging.info("Espacio de trabajo listo")
 
 	def ensure_ready(self) -> None:
 		"""Public entrypoint to ensure sandbox and workspace are initialized (idempotent). Use from middleware."""
 		self._ensure_initialized()
 
+	def start_initialization(self) -> Future:
+		"""Kick off ``ensure_ready`` on the sandbox I/O pool without waiting for it."""
+		# Lets the cold start (sandbox create, S3 hydrate, skills checkout) overlap with the model's first turn;
+		# tool calls block on ``_init_lock`` only for whatever is still left. Repeated calls reuse the pending future.
+		with self._init_future_lock:
+			pending = self._init_future
+			if pending is None or pending.done():
+				ctx = contextvars.copy_context()
+				pending = self._init_future = _SANDBOX_IO_EXECUTOR.submit(ctx.run, self._ensure_initialized)
+			return pending
+
 	def is_available(self) -> bool:
 		"""Return True when the backend has a connected E2B sandbox and has completed initialization."""
 		return self._sandbox is not None and self._initialized
 
+	@cached_property
+	def _thread_s3_remote(self) -> str:
+		"""The rclone remote path of this thread's workspace in S3."""
+		return f"s3remote:{_s3_config().bucket}/{self._tenant_id}/threads/{self._thread_id}"
+
+	@cached_property
+	def _thread_sync_lock_base(self) -> str:
+		"""Path prefix of this thread's sync locks and change stamp under SOLVEN_LOCKS."""
+		return f"{SOLVEN_LOCKS}/sync-{self._thread_id}"
+
+	def _workspace_full_sync_cmd(self, flags: str) -> str:
+		"""Shell command: sync thread workspace dir to S3 with the given rclone flags."""
+		# On success the change stamp advances, so later incremental syncs only look at files changed since,
+		# and so does the full-sync stamp (the incremental sync never deletes, so it must not advance that one).
+		base = self._thread_sync_lock_base
+		stamp, full = shlex.quote(f"{base}.stamp"), shlex.quote(f"{base}.full")
+		return (
+			f"mkdir -p {shlex.quote(SOLVEN_LOCKS)} 2>/dev/null; touch {stamp}.next {full}.next 2>/dev/null; "
+			f"rclone sync {flags} {_RCLONE_WORKSPACE_EXCLUDES} "
+			f"{shlex.quote(self._workspace)}/ {shlex.quote(self._thread_s3_remote)}/ 2>/dev/null "
+			f"&& mv -f {stamp}.next {stamp} 2>/dev/null && mv -f {full}.next {full} 2>/dev/null || true"
+		)
+
+	@cached_property
 	def _thread_workspace_rclone_sync_cmd(self) -> str:
-		"""Shell command: sync thread workspace dir to S3 (same flags as hydrate/persist)."""
-		bucket = (os.getenv("S3_BUCKET_NAME") or "solven-testing").strip()
-		remote = f"s3remote:{bucket}/{self._tenant_id}/threads/{self._thread_id}"
-		excludes = "--exclude '.solven/**' --exclude '.venv/**' --exclude 'node_modules/**' --exclude '.bun/**' --exclude '.git/**'"
-		cfg = "--config /root/.config/rclone/rclone.conf --fast-list --transfers 4 --no-update-modtime"
+		"""Full workspace → S3 sync used by background syncs. Constant per backend, built once."""
+		# Skipped when nothing under the workspace changed since the last successful full sync: a local
+		# ``find -cnewer`` that stops at the first hit, instead of rclone listing the whole remote. Directories
+		# are included, so deletions and renames (which touch the parent directory) still trigger the sync.
+		stamp = shlex.quote(f"{self._thread_sync_lock_base}.full")
 		return (
-			f"rclone sync {cfg} {excludes} {shlex.quote(self._workspace)}/ {shlex.quote(remote)}/ 2>/dev/null || true"
+			f"if [ -f {stamp} ] && [ -z \"$(cd {shlex.quote(self._workspace)} && "
+			f"find . \\( {_WORKSPACE_SYNC_PRUNE_EXPR} \\) -prune -o -cnewer {stamp} -print -quit 2>/dev/null)\" ]; "
+			f"then :; else {self._workspace_full_sync_cmd(_RCLONE_FLAGS)}; fi"
 		)
 
-	def _schedule_workspace_sync_to_s3(self) -> None:
-		"""Non-blocking upload of workspace → S3 (cold backup). Safe to call after every mutation."""
+	@cached_property
+	def _thread_workspace_incremental_sync_cmd(self) -> str:
+		"""Upload only files whose inode changed since the last successful sync (never deletes remotely)."""
+		# find -cnewer the stamp, then ``rclone copy --files-from-raw``: a local stat walk instead of listing and
+		# comparing the whole remote. Only used after mutations that cannot remove files (write/edit/upload).
+		# Without a stamp (first sync on this sandbox) it falls back to the full sync.
+		base = self._thread_sync_lock_base
+		stamp, changed = shlex.quote(f"{base}.stamp"), shlex.quote(f"{base}.changed")
+		return (
+			f"if [ -f {stamp} ]; then "
+			f"touch {stamp}.next && cd {shlex.quote(self._workspace)} && "
+			f"find . \\( {_WORKSPACE_SYNC_PRUNE_EXPR} \\) -prune -o -type f -cnewer {stamp} -printf '%P\\n' > {changed} && "
+			f"{{ [ ! -s {changed} ] || rclone copy {_RCLONE_FLAGS} --files-from-raw {changed} "
+			f"./ {shlex.quote(self._thread_s3_remote)}/ 2>/dev/null; }} "
+			f"&& mv -f {stamp}.next {stamp} || true; "
+			f"else {self._thread_workspace_rclone_sync_cmd}; fi"
+		)
+
+	def _coalesced_sync_cmd(self, sync: str, queue: str) -> str:
+		"""Background-sync wrapper that coalesces bursts: at most one rclone run in flight plus one queued per ``queue``."""
+		# A caller that finds another sync of the same kind already queued exits at once (the queued run starts
+		# after its writes and will pick them up); the queued one drops its slot as soon as it starts running.
+		# Full and incremental syncs queue separately (an incremental run does not cover deletions) but never overlap.
+		lock = shlex.quote(self._thread_sync_lock_base)
+		return (
+			f"mkdir -p {shlex.quote(SOLVEN_LOCKS)} 2>/dev/null; "
+			f"if command -v flock >/dev/null 2>&1; then "
+			f"( flock -n 9 || exit 0; flock 8; flock -u 9; {sync}; ) 9>{lock}.queued-{queue} 8>{lock}.running; "
+			f"else {sync}; fi"
+		)
+
+	@cached_property
+	def _thread_workspace_coalesced_sync_cmd(self) -> str:
+		return self._coalesced_sync_cmd(self._thread_workspace_rclone_sync_cmd, "full")
+
+	@cached_property
+	def _thread_workspace_coalesced_incremental_sync_cmd(self) -> str:
+		return self._coalesced_sync_cmd(self._thread_workspace_incremental_sync_cmd, "incremental")
+
+	def invalidate_search_cache(self) -> None:
+		"""Drop cached ls_info / glob_info / grep_raw results and known-missing download paths (call after anything that may change workspace files)."""
+		with self._search_cache_lock:
+			self._search_cache.clear()
+			self._missing_paths.clear()
+			self._search_cache_generation += 1
+
+	def _search_cache_get(self, key: tuple) -> tuple | None:
+		with self._search_cache_lock:
+			entry = self._search_cache.get(key)
+			if entry is None:
+				return None
+			stored_at, value = entry
+			if _time.monotonic() - stored_at > _SEARCH_CACHE_TTL_SEC:
+				del self._search_cache[key]
+				return None
+			self._search_cache.move_to_end(key)
+			return value
+
+	def _search_cache_put(self, key: tuple, value: tuple, generation: int) -> None:
+		"""Store a successful search result, unless the cache was invalidated since the search started."""
+		with self._search_cache_lock:
+			if generation != self._search_cache_generation:
+				return
+			self._search_cache[key] = (_time.monotonic(), value)
+			self._search_cache.move_to_end(key)
+			while len(self._search_cache) > _SEARCH_CACHE_MAXSIZE:
+				self._search_cache.popitem(last=False)
+
+	def _schedule_workspace_sync_to_s3(self, incremental: bool = False) -> None:
+		"""Non-blocking upload of workspace → S3 (cold backup). Safe to call after every mutation; also drops cached search results."""
+		# incremental=True uploads only files changed since the last sync and never deletes remotely: use it only
+		# after mutations that cannot remove files (write/edit/upload). Arbitrary commands need the full sync.
+		self.invalidate_search_cache()
 		if not self._sandbox or not self._workspace_ready:
 			return
+		sync = self._thread_workspace_coalesced_incremental_sync_cmd if incremental else self._thread_workspace_coalesced_sync_cmd
 		try:
-			self._sandbox.commands.run(
-				self._thread_workspace_rclone_sync_cmd(),
+			handle = self._sandbox.commands.run(
+				f"{{ {sync}; }} >/dev/null 2>&1",
 				timeout=0,
 				background=True,
 				user="root",
 				envs=self._s3_envs(),
 			)
+			# Nobody waits on the result: stop streaming its events instead of holding the connection open until rclone exits.
+			handle.disconnect()
 		except Exception as e:
 			logging.warning("_schedule_workspace_sync_to_s3: %s", e)
 
+	def _with_workspace_sync(self, full_cmd: str) -> str:
+		"""Append the coalesced full workspace sync to ``full_cmd``, detached, in the same round-trip."""
+		# Same effect as ``_schedule_workspace_sync_to_s3`` after the command, without the second RPC. The sync
+		# runs with every fd redirected, so the run returns as soon as the command exits (with its exit code);
+		# rclone reads its credentials from rclone.conf, so no S3 envs reach the agent's command.
+		return (
+			f"{full_cmd}; ec=$?; "
+			f"( {self._thread_workspace_coalesced_sync_cmd}; ) </dev/null >/dev/null 2>&1 & exit $ec"
+		)
+
 	def persist_workspace(self) -> None:
 		"""Blocking one-shot sync of thread workspace to S3. For explicit on-demand guarantees."""
 		if not self._sandbox or not self._workspace_ready:
 			return
 		try:
 			self._sandbox.commands.run(
-				self._thread_workspace_rclone_sync_cmd(),
+				self._workspace_full_sync_cmd(_RCLONE_BULK_FLAGS),
 				timeout=300,
 				user="root",
 				envs=self._s3_envs(),
@@ -694,32 +1239,43 @@ class SandboxBackend(BaseSandbox):
 
 	def _configure_rclone(self) -> None:
 		"""Upload and run create_rclone_config.sh to create /root/.config/rclone/rclone.conf. Required for rclone sync/copy in hydrate and persist."""
-		src_dir = os.path.dirname(os.path.abspath(__file__))
-		script_path = os.path.join(src_dir, "e2b_sandbox", "scripts", "create_rclone_config.sh")
-		with open(script_path, "r") as f:
-			config_script = f.read()
-		b64 = base64.b64encode(config_script.encode("utf-8")).decode("ascii")
-		result = self._sandbox.commands.run(
-			f"echo {shlex.quote(b64)} | base64 -d > /root/create_rclone_config.sh",
-			timeout=30, user="root",
-		)
-		if result.exit_code != 0:
-			raise RuntimeError(f"Failed to write create_rclone_config.sh: {result.stderr or result.stdout}")
-		result = self._sandbox.commands.run(
-			"cp /root/create_rclone_config.sh /tmp/create_rclone_config.sh && chmod +x /tmp/create_rclone_config.sh",
-			timeout=10, user="root",
-		)
-		if result.exit_code != 0:
-			raise RuntimeError(f"Failed to cp/chmod create_rclone_config.sh: {result.stderr or result.stdout}")
+		# The config is shared by every thread on the sandbox: a fingerprint of script + credentials is stored next to it,
+		# and when it matches (another thread already configured rclone with the same settings) nothing is rewritten.
+		# Creates the boot dirs (``_boot_dirs_cmd``) in the same round-trip.
+		b64 = _e2b_resource_b64("scripts", "create_rclone_config.sh")
 		rclone_envs = self._s3_envs()
 		if not rclone_envs.get("S3_ACCESS_KEY_ID") or not rclone_envs.get("S3_ACCESS_SECRET"):
 			raise RuntimeError("S3_ACCESS_KEY_ID and S3_ACCESS_SECRET required for rclone config")
-		run_result = self._sandbox.commands.run(
-			"/tmp/create_rclone_config.sh",
-			timeout=30, user="root", envs=rclone_envs,
+		fingerprint = _rclone_config_fingerprint()
+		sandbox_id = self._sandbox.sandbox_id
+		if _rclone_configured.get(sandbox_id) == fingerprint:
+			# This process already configured this sandbox with the same script and credentials: only the
+			# boot dirs are left, without shipping the script or comparing fingerprints in the sandbox.
+			self._ensure_boot_dirs()
+			return
+		# Write, install and run the script in one round-trip; distinct exit codes keep the failing step identifiable.
+		cmd = (
+			f"{self._boot_dirs_cmd} || exit 100; "
+			f"[ -s /root/.config/rclone/rclone.conf ] && "
+			f"[ \"$(cat /root/.config/rclone/.solven-fingerprint 2>/dev/null)\" = {fingerprint} ] && exit 0; "
+			f"{{ echo {shlex.quote(b64)} | base64 -d > /root/create_rclone_config.sh; }} || exit 101; "
+			"{ cp /root/create_rclone_config.sh /tmp/create_rclone_config.sh && chmod +x /tmp/create_rclone_config.sh; } || exit 102; "
+			f"/tmp/create_rclone_config.sh && echo {fingerprint} > /root/.config/rclone/.solven-fingerprint"
 		)
-		if run_result.exit_code != 0:
-			raise RuntimeError(f"create_rclone_config.sh failed: {run_result.stderr or run_result.stdout}")
+		try:
+			result = self._sandbox.commands.run(cmd, timeout=60, user="root", envs=rclone_envs)
+			exit_code, detail = result.exit_code, result.stderr or result.stdout
+		except CommandExitException as e:
+			exit_code, detail = e.exit_code, e.stderr or e.stdout
+		if exit_code == 100:
+			raise RuntimeError(f"Failed to create workspace dirs: {detail}")
+		if exit_code == 101:
+			raise RuntimeError(f"Failed to write create_rclone_config.sh: {detail}")
+		if exit_code == 102:
+			raise RuntimeError(f"Failed to cp/chmod create_rclone_config.sh: {detail}")
+		if exit_code != 0:
+			raise RuntimeError(f"create_rclone_config.sh failed: {detail}")
+		_rclone_configured[sandbox_id] = fingerprint
 
 	def _execute_env(self) -> dict[str, str]:
 		"""Environment for commands run in thread workspace (bwrap binds it as /)."""
@@ -732,35 +1288,14 @@ class SandboxBackend(BaseSandbox):
 			"BUN_INSTALL": "/.bun",
 		}
 
-	def _ensure_bwrap(self) -> None:
-		"""Verify bwrap is available; cache result."""
-		if self._bwrap_available is not None:
-			return
-		try:
-			result = self._sandbox.commands.run("which bwrap", timeout=10, user="root")
-			self._bwrap_available = result.exit_code == 0 and bool((result.stdout or "").strip())
-		except Exception:
-			self._bwrap_available = False
-		if not self._bwrap_available:
-			return
-
 	def _filter_unwanted_commands(self, command: str) -> Optional[str]:
 		"""Block install commands so deps use uv (Python) and bun (Node). Allow pip/npm/npx for non-install (e.g. pip list, npm run)."""
-		unwanted = {
-			r"\bsudo\b": "Not allowed: sudo is not allowed in sandbox environment.",
-			r"\bapt-get\s+(install|update)\b": "Not allowed: apt-get is not allowed (system packages pre-installed).",
-			r"\bapt\s+(install|update)\b": "Not allowed: apt is not allowed (system packages pre-installed).",
-			r"pip\s+install": "Not allowed: use uv for Python dependencies (e.g. uv add <pkg> or uv sync).",
-			r"npm\s+install\b": "Not allowed: use bun for Node dependencies (e.g. bun add <pkg> or bun install).",
-			r"npm\s+i\s": "Not allowed: use bun for Node dependencies (e.g. bun add <pkg> or bun install).",
-		}
-		for pattern, message in unwanted.items():
-			if re.search(pattern, command, re.IGNORECASE):
-				return message
-		return None
+		m = _UNWANTED_COMMAND_RE.search(command)
+		return _UNWANTED_COMMAND_MESSAGES[m.lastgroup] if m else None
 
-	def _build_bwrap_command(self, command: str) -> str:
-		"""Wrap command in bwrap: workspace → /; --dir /.solven; /opt/solven/skills and user-models bound into /.solven/skills."""
+	@cached_property
+	def _bwrap_prefix(self) -> str:
+		"""Quoted bwrap invocation up to ``bash -c``. Arguments depend only on the workspace, so quote them once."""
 		path_env = "/.venv/bin:/.local/bin:/.bun/bin:/node_modules/.bin:/usr/local/bin:/usr/bin:/bin"
 		args = [
 			"bwrap",
@@ -791,13 +1326,18 @@ class SandboxBackend(BaseSandbox):
 			"--setenv", "BUN_INSTALL", "/.bun",
 			"--setenv", "NODE_PATH", "/node_modules",
 			"--",
-			"/bin/bash", "-c", command,
+			"/bin/bash", "-c",
 		]
 		return " ".join(shlex.quote(str(a)) for a in args)
 
+	def _build_bwrap_command(self, command: str) -> str:
+		"""Wrap command in bwrap: workspace → /; --dir /.solven; /opt/solven/skills and user-models bound into /.solven/skills."""
+		return f"{self._bwrap_prefix} {shlex.quote(command)}"
+
 	def _run_bwrap_readonly(self, command: str) -> ExecuteResponse:
 		"""Run a trusted shell command in the same bwrap as ``execute`` without filter, dirty flag, or persist."""
-		self._ensure_initialized()
+		# Callers are the public read paths (ls_info, glob_info, grep_raw, read, download_files), which have
+		# already run ``_ensure_initialized``; it is not repeated here.
 		if not self._workspace_ready:
 			return ExecuteResponse(
 				output="Error: workspace not ready (sandbox init did not complete).",
@@ -814,7 +1354,7 @@ class SandboxBackend(BaseSandbox):
 		try:
 			result = self._sandbox.commands.run(
 				full_cmd,
-				timeout=1200,
+				timeout=_READONLY_COMMAND_TIMEOUT_SEC,
 				user="root",
 			)
 		except CommandExitException as e:
@@ -846,37 +1386,93 @@ class SandboxBackend(BaseSandbox):
 		Returns (content, None) on success, or (None, error_code) where error_code is
 		``file_not_found``, ``is_directory``, or a short error string.
 		"""
-		norm = self._normalize_agent_path(agent_path)
-		pb = base64.b64encode(norm.encode("utf-8")).decode("ascii")
-		script = f"""import base64,os,sys
-p=base64.b64decode({repr(pb)}).decode("utf-8")
-if not os.path.lexists(p):
-    sys.exit(2)
-if os.path.isdir(p):
-    sys.exit(3)
-if not os.path.isfile(p):
-    sys.exit(4)
-with open(p,"rb") as f:
-    sys.stdout.buffer.write(base64.b64encode(f.read()))
+		return self._read_files_bytes_via_bwrap([agent_path])[0]
+
+	def _read_files_bytes_via_bwrap(self, agent_paths: list[str]) -> list[tuple[bytes | None, str | None]]:
+		"""Batch variant of ``_read_file_bytes_via_bwrap``: one bwrap exec for all paths, one result per path (same order)."""
+		if not agent_paths:
+			return []
+		norms = [self._normalize_agent_path(p) for p in agent_paths]
+		pb = base64.b64encode(json.dumps(norms).encode("utf-8")).decode("ascii")
+		# One line per path: "O <base64>" on success, "E <error_code>" otherwise.
+		# Open first and classify with fstat on the open fd (missing -> ENOENT) instead of lexists/isdir/isfile
+		# stats before every open. O_NONBLOCK keeps FIFOs from hanging the read; only regular files are returned.
+		# Files are encoded in 192 KiB slices (a multiple of 3, so the pieces concatenate into valid base64) and
+		# never held whole in the sandbox; a read failing mid-file ends its line with "*" (not a base64 character).
+		script = f"""import base64,json,os,stat,sys
+w=sys.stdout.buffer.write
+for p in json.loads(base64.b64decode({repr(pb)}).decode("utf-8")):
+    try:
+        fd=os.open(p,os.O_RDONLY|os.O_NONBLOCK)
+    except FileNotFoundError:
+        w(b"E file_not_found\\n"); continue
+    except Exception as e:
+        w(("E download_error: "+str(e).replace("\\n"," ")[:300]+"\\n").encode("utf-8")); continue
+    started=False
+    try:
+        m=os.fstat(fd).st_mode
+        if stat.S_ISDIR(m):
+            w(b"E is_directory\\n"); continue
+        if not stat.S_ISREG(m):
+            w(b"E file_not_found\\n"); continue
+        with os.fdopen(fd,"rb") as f:
+            fd=-1
+            w(b"O "); started=True
+            for c in iter(lambda:f.read(196608),b""): w(base64.b64encode(c))
+            w(b"\\n")
+    except Exception as e:
+        w(b"*\\n" if started else ("E download_error: "+str(e).replace("\\n"," ")[:300]+"\\n").encode("utf-8"))
+    finally:
+        if fd>=0: os.close(fd)
 """
 		cmd = "python3 -c " + shlex.quote(script)
 		res = self._run_bwrap_readonly(cmd)
-		if res.exit_code == 2:
-			return None, "file_not_found"
-		if res.exit_code == 3:
-			return None, "is_directory"
-		if res.exit_code == 4:
-			return None, "file_not_found"
 		if res.exit_code != 0:
 			msg = (res.output or "").strip() or "nonzero exit"
-			return None, f"download_error: {msg[:300]}"
+			return [(None, f"download_error: {msg[:300]}")] * len(agent_paths)
+		# Walk the output by offsets instead of splitlines(): each payload is sliced out once and decoded,
+		# so peak memory is the output plus one file rather than two full copies of every base64 body.
+		out = res.output or ""
+		pos = 0
+		results: list[tuple[bytes | None, str | None]] = []
+		for _ in agent_paths:
+			end = out.find("\n", pos)
+			if end < 0:
+				end = len(out)
+			tag = out[pos:pos + 2]
+			if tag == "O " and out[end - 1] == "*":
+				results.append((None, "download_error: read failed mid-file"))
+			elif tag == "O ":
+				try:
+					results.append((base64.b64decode(out[pos + 2:end]), None))
+				except Exception as e:
+					results.append((None, f"download_error: {e!s}"))
+			elif tag == "E ":
+				results.append((None, out[pos + 2:end].rstrip("\r")))
+			else:
+				results.append((None, "download_error: missing output"))
+			pos = end + 1
+		return results
+
+	def _read_files_bytes_chunked(self, agent_paths: list[str]) -> list[tuple[bytes | None, str | None]]:
+		"""Read a large batch via ``_read_files_bytes_via_bwrap`` in concurrent chunks of _DOWNLOAD_BATCH_SIZE paths."""
+		# One huge stdout would serialize the whole transfer. Errors are per chunk; order is kept.
+
+		chunks = _download_chunks(agent_paths)
+		if len(chunks) <= 1:
+			return self._read_chunk(agent_paths) if agent_paths else []
+		with ThreadPoolExecutor(max_workers=min(_DOWNLOAD_CONCURRENCY, len(chunks))) as pool:
+			return [r for part in pool.map(self._read_chunk, chunks) for r in part]
+
+	def _read_chunk(self, chunk: list[str]) -> list[tuple[bytes | None, str | None]]:
+		"""One ``_read_files_bytes_via_bwrap`` call; a failure becomes a per-path download_error."""
 		try:
-			return base64.b64decode(res.output.strip()), None
+			return self._read_files_bytes_via_bwrap(chunk)
 		except Exception as e:
-			return None, f"download_error: {e!s}"
+			return [(None, f"download_error: {str(e)}")] * len(chunk)
 
-	def execute(self, command: str) -> ExecuteResponse:
-		"""Execute a shell command inside bwrap (workspace bound as /). No path rewriting; run command as-is."""
+	def _prepare_execute(self, command: str) -> ExecuteResponse | str:
+		"""Front half of execute / aexecute: init, guards and filter. Returns the command line to run, or the error response."""
 		self._ensure_initialized()
 		if not self._workspace_ready:
 			return ExecuteResponse(
@@ -895,38 +1491,86 @@ with open(p,"rb") as f:
 			return ExecuteResponse(output=error_msg, exit_code=1, truncated=False)
 
 		full_cmd = self._build_bwrap_command(command)
+		if not _command_is_read_only(command) and not _SUPPRESS_EXECUTE_SYNC.get():
+			full_cmd = self._with_workspace_sync(full_cmd)
+		return full_cmd
+
+	def _run_prepared(self, full_cmd: str) -> ExecuteResponse:
+		"""Back half of execute: run the prepared command line on the sync handle."""
 		try:
 			result = self._sandbox.commands.run(
 				full_cmd,
-				timeout=1200,
+				timeout=_EXECUTE_TIMEOUT_SEC,
 				user="root",
 			)
 		except CommandExitException as e:
-			result_stdout = e.stdout or ""
-			result_stderr = e.stderr or ""
-			self._schedule_workspace_sync_to_s3()
-			return ExecuteResponse(
-				output=result_stdout + result_stderr,
-				exit_code=e.exit_code,
-				truncated=False,
-			)
+			return _exit_response(e)
 		except Exception as e:
-			return ExecuteResponse(
-				output=f"Error executing command: {str(e)}",
-				exit_code=1,
-				truncated=False,
-			)
+			return _execute_error_response(e)
+		return _result_response(result)
 
-		self._schedule_workspace_sync_to_s3()
-		return ExecuteResponse(
-			output=(result.stdout or "") + (result.stderr or ""),
-			exit_code=result.exit_code,
-			truncated=False,
-		)
+	def execute(self, command: str) -> ExecuteResponse:
+		"""Execute a shell command inside bwrap (workspace bound as /). No path rewriting; run command as-is."""
+		prepared = self._prepare_execute(command)
+		if isinstance(prepared, ExecuteResponse):
+			return prepared
+		try:
+			return self._run_prepared(prepared)
+		finally:
+			# Once the command is done, whatever it wrote (the read-only check only gates the sync) is visible.
+			self.invalidate_search_cache()
 	
+	async def _await_pending_init(self) -> None:
+		"""Wait on an init started by ``start_initialization`` without parking a pool thread on ``_init_lock``."""
+		# Failures are left to the sync ``_ensure_initialized`` that every operation runs next (it retries the init).
+		pending = self._init_future
+		if pending is not None and not pending.done():
+			with contextlib.suppress(Exception):
+				await asyncio.wrap_future(pending)
+
+	async def _async_sandbox(self) -> AsyncSandbox:
+		"""Native async handle on the current sandbox, connected once per sandbox id and event loop (see _async_sandbox_handles)."""
+		sandbox_id = self._sandbox.sandbox_id
+		handles = _async_sandbox_handles.setdefault(asyncio.get_running_loop(), {})
+		handle = handles.get(sandbox_id)
+		if handle is None:
+			handle = handles[sandbox_id] = await AsyncSandbox.connect(sandbox_id)
+		return handle
+
 	async def aexecute(self, command: str) -> ExecuteResponse:
 		"""Async version of execute."""
-		return await asyncio.to_thread(self.execute, command)
+		# Only the short setup (init check, guards) goes through the I/O pool; the command itself is awaited on
+		# the native async handle, so long-running agent commands do not each hold a pool thread for their duration.
+		# Falls back to the sync handle when the async one cannot connect.
+		await self._await_pending_init()
+		prepared = await _run_in_io_pool(self._prepare_execute, command)
+		if isinstance(prepared, ExecuteResponse):
+			return prepared
+		try:
+			return await self._arun_prepared(prepared)
+		finally:
+			self.invalidate_search_cache()
+
+	async def _arun_prepared(self, prepared: str) -> ExecuteResponse:
+		"""Async back half of execute: await the prepared command line on the native async handle."""
+		try:
+			sandbox = await self._async_sandbox()
+		except Exception as e:
+			logging.warning("aexecute: async sandbox connect failed, using the sync handle: %s", e)
+			return await _run_in_io_pool(self._run_prepared, prepared)
+		try:
+			result = await sandbox.commands.run(
+				prepared,
+				timeout=_EXECUTE_TIMEOUT_SEC,
+				user="root",
+			)
+		except CommandExitException as e:
+			return _exit_response(e)
+		except Exception as e:
+			# The handle may belong to a sandbox that died or was replaced: reconnect on the next call.
+			_async_sandbox_handles.get(asyncio.get_running_loop(), {}).pop(sandbox.sandbox_id, None)
+			return _execute_error_response(e)
+		return _result_response(result)
 
 	def ls_info(self, path: str) -> list[FileInfo]:
 		"""
@@ -935,9 +1579,31 @@ with open(p,"rb") as f:
 		"""
 		self._ensure_initialized()
 		path = self._normalize_agent_path(path)
-		result = super().ls_info(path)
-		out = [p for p in result if self._is_workspace_path(p["path"])]
-		return out
+		# Hidden system dirs: nothing under them is agent-visible; at "/" find itself drops them.
+		if not self._is_workspace_path(path):
+			return []
+		cache_key = ("ls", path)
+		cached = self._search_cache_get(cache_key)
+		if cached is not None:
+			return [row.to_file_info() for row in cached]
+		generation = self._search_cache_generation
+		hidden_filter = f"{_AGENT_HIDDEN_TOPLEVEL_FIND_EXPR} " if path == "/" else ""
+		# One find pass with structured output (type, size, mtime, path) instead of a python3 scandir script.
+		cmd = (
+			f"find {shlex.quote(path)} -mindepth 1 -maxdepth 1 {hidden_filter}"
+			f"-printf '%y\\t%s\\t%T@\\t%p\\n' 2>/dev/null"
+		)
+		result = self._run_bwrap_readonly(cmd)
+		rows: list[_FileRow] = []
+		for kind, size, mtime, entry_path in _LS_ROW_RE.findall(result.output or ""):
+			try:
+				modified_at = datetime.fromtimestamp(float(mtime), tz=UTC).isoformat()
+			except ValueError:
+				modified_at = None
+			rows.append(_FileRow(entry_path, int(size) if size else 0, modified_at, kind == "d"))
+		if result.exit_code == 0:
+			self._search_cache_put(cache_key, tuple(rows), generation)
+		return [row.to_file_info() for row in rows]
 
 	def glob_info(self, pattern: str, path: str = "/") -> list["FileInfo"]:
 		"""List files matching pattern via find -iname (case-insensitive) so e.g. **/acta* matches ACTA JUNTA UNIVERSAL."""
@@ -948,19 +1614,47 @@ with open(p,"rb") as f:
 		basename_pattern = pattern.split("/")[-1] if "/" in pattern else pattern
 		if not basename_pattern or basename_pattern == "**":
 			basename_pattern = "*"
-		# Prune skip dirs only ( -type d -name d1 -o -type d -name d2 ... ) -prune -o -type f -iname 'pattern' -print
-		prune_expr = " -o ".join(f"-type d -name {shlex.quote(d)}" for d in _WORKSPACE_SEARCH_SKIP_DIRS)
+		match_expr = f"-iname {shlex.quote(basename_pattern)}"
+		rel_pattern = pattern.strip("/")
+		if rel_pattern.rpartition("/")[0].strip("*/"):
+			# Real directory component (e.g. src/**/*.py): match the whole path, otherwise it would be ignored.
+			# find's * also spans '/', so "**/" collapses to nothing; a leading "**/" means "anywhere".
+			if rel_pattern.startswith("**/"):
+				path_glob = "*/" + rel_pattern[3:].replace("**/", "")
+			else:
+				path_glob = f"{search_path.rstrip('/')}/" + rel_pattern.replace("**/", "")
+			match_expr = f"-ipath {shlex.quote(path_glob)}"
+		cache_key = ("glob", match_expr, search_path)
+		cached = self._search_cache_get(cache_key)
+		if cached is not None:
+			return [row.to_file_info() for row in cached]
+		if "/" in pattern.strip("/") and not any(c in pattern for c in "*?["):
+			# Literal relative path (e.g. src/package.json): stat that one path first. A bare name still needs the
+			# recursive walk (it matches at any depth), and a miss falls through to it (matching is case-insensitive).
+			full = f"{search_path.rstrip('/')}/{pattern.strip('/')}"
+			if not self._is_workspace_path(full):
+				return []
+			result = self._run_bwrap_readonly(
+				f"find {shlex.quote(full)} -maxdepth 0 -type f -printf '%s|%T@|%p\\n' 2>/dev/null"
+			)
+			rows = _parse_find_file_rows(result.output)
+			if rows:
+				return [row.to_file_info() for row in rows]
+		generation = self._search_cache_generation
+		# Prune skip dirs only ( -type d -name d1 -o -type d -name d2 ... ) -prune -o -type f -iname 'pattern' -printf ...
+		# -printf emits size and mtime from the same traversal (no per-file stat); path goes last so '|' in names is safe.
+		# pipefail so a failed find is not hidden behind head's exit code (141: SIGPIPE once head has its lines).
 		cmd = (
-			f"find {shlex.quote(search_path)} "
-			f"\\( {prune_expr} \\) -prune -o -type f -iname {shlex.quote(basename_pattern)} -print 2>/dev/null"
+			f"set -o pipefail; {{ find {shlex.quote(search_path)} "
+			f"\\( {_WORKSPACE_SEARCH_PRUNE_EXPR} \\) -prune -o -type f {match_expr} "
+			f"-printf '%s|%T@|%p\\n' 2>/dev/null; rc=$?; [ $rc -eq 0 ] || [ $rc -eq 141 ]; }} "
+			f"| head -n {_SEARCH_MAX_RESULTS}"
 		)
-		result = self.execute(cmd)
-		file_infos: list = []
-		for line in (result.output or "").splitlines():
-			line = line.strip()
-			if line:
-				file_infos.append({"path": line, "is_dir": False})
-		return file_infos
+		result = self._run_bwrap_readonly(cmd)
+		rows = _parse_find_file_rows(result.output)
+		if result.exit_code == 0:
+			self._search_cache_put(cache_key, tuple(rows), generation)
+		return [row.to_file_info() for row in rows]
 
 	def grep_raw(
 		self,
@@ -968,58 +1662,119 @@ with open(p,"rb") as f:
 		path: str | None = None,
 		glob: str | None = None,	
 	) -> "list[GrepMatch] | str":
-		"""Same as base (grep -rHnF via execute) but with --exclude-dir so root search is fast."""
+		"""Literal search like base (grep -rHnF) but via ripgrep when available, skipping cache/system dirs so root search is fast."""
 		self._ensure_initialized()
 		norm = self._normalize_agent_path(path or "/")
+		cache_key = ("grep", pattern, norm, glob)
+		cached = self._search_cache_get(cache_key)
+		if cached is not None:
+			return [row.to_grep_match() for row in cached]
+		generation = self._search_cache_generation
 		search_path = shlex.quote(norm.rstrip("/") or "/")
-		skip_dirs = set(_WORKSPACE_SEARCH_SKIP_DIRS)
-		exclude_dirs = " ".join(f"--exclude-dir={d}" for d in skip_dirs)
-		glob_pattern = f"--include={shlex.quote(glob)}" if glob else ""
+		quoted_pattern = shlex.quote(pattern)
+		# The same glob for both tools (rg --type would widen it, e.g. ts also matching .tsx), so results
+		# do not depend on whether the template ships rg.
+		rg_glob = f"-g {shlex.quote(glob)}" if glob else ""
+		grep_glob = f"--include={shlex.quote(glob)}" if glob else ""
+		# pipefail so the exit code is the search's, not head's or cut's. 1 (no match) and 141 (SIGPIPE once head
+		# has its lines) are successful searches; anything else is an error and is not cached.
 		cmd = (
-			f"grep -rHnF {exclude_dirs} {glob_pattern} "
-			f"-e {shlex.quote(pattern)} {search_path} 2>/dev/null || true"
+			f"set -o pipefail; {{ if command -v rg >/dev/null 2>&1; then "
+			f"rg {_RG_GREP_FLAGS} --max-count={_GREP_MAX_MATCHES_PER_FILE} "
+			f"{_WORKSPACE_SEARCH_RG_EXCLUDES} {rg_glob} -e {quoted_pattern} {search_path}; "
+			f"else grep -rHnFI --max-count={_GREP_MAX_MATCHES_PER_FILE} "
+			f"{_WORKSPACE_SEARCH_GREP_EXCLUDES} {grep_glob} -e {quoted_pattern} {search_path} "
+			f"| cut -c1-{_GREP_FALLBACK_MAX_LINE_CHARS}; "
+			f"fi 2>/dev/null; rc=$?; [ $rc -le 1 ] || [ $rc -eq 141 ]; }} | head -n {_SEARCH_MAX_RESULTS}"
 		)
-		result = self.execute(cmd)
-		output = (result.output or "").rstrip()
-		if not output:
-			return []
-		matches: list = []
-		for line in output.split("\n"):
-			parts = line.split(":", 2)
-			if len(parts) >= 3:
-				try:
-					matches.append({"path": parts[0], "line": int(parts[1]), "text": parts[2]})
-				except ValueError:
-					continue
-		return matches
+		result = self._run_bwrap_readonly(cmd)
+		# One regex scan over the whole output; the first ":<digits>:" delimits path and line, so ':' in names is fine.
+		rows = tuple(
+			_GrepRow(m.group(1), int(m.group(2)), m.group(3))
+			for m in _GREP_LINE_RE.finditer(result.output or "")
+		)
+		if result.exit_code == 0:
+			self._search_cache_put(cache_key, rows, generation)
+		return [row.to_grep_match() for row in rows]
 
-	def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
-		self._ensure_initialized()
-		responses = []
+	def _upload_one(self, path: str, content: bytes) -> FileUploadResponse:
+		"""Write one upload under /adjuntos/ (no S3 sync; callers schedule it once per batch)."""
+		try:
+			path = self._normalize_upload_path_to_adjuntos(path)
+			real_path = self._resolve_workspace_path(path)
 
-		for path, content in files:
+			# files.write takes bytes as-is: no UTF-8 decode/re-encode round-trip for text uploads.
+			data = content if isinstance(content, bytes) else str(content).encode("utf-8")
 			try:
-				path = self._normalize_upload_path_to_adjuntos(path)
-				real_path = self._resolve_workspace_path(path)
-
+				# Parent (usually /adjuntos) normally exists already: one round-trip instead of mkdir + write.
+				self._sandbox.files.write(real_path, data)
+			except Exception:
 				parent = os.path.dirname(real_path)
 				self._sandbox.commands.run(f"mkdir -p {shlex.quote(parent)}", timeout=10)
+				self._sandbox.files.write(real_path, data)
 
-				if isinstance(content, bytes):
-					try:
-						self._sandbox.files.write(real_path, content.decode("utf-8"))
-					except UnicodeDecodeError:
-						self._sandbox.files.write(real_path, content)
-				else:
-					self._sandbox.files.write(real_path, str(content))
+			return FileUploadResponse(path=path, error=None)
 
-				responses.append(FileUploadResponse(path=path, error=None))
+		except Exception:
+			return FileUploadResponse(path=path, error="permission_denied")
+
+	def _upload_batch_tar(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse] | None:
+		"""Upload several files as one tar (one files.write plus one extract); None when per-file uploads are needed."""
+		# Replaces mkdir + write per file. None means the batch could not be written/extracted.
+		buf = io.BytesIO()
+		agent_paths: list[str] = []
+		now = int(_time.time())
+		with tarfile.open(fileobj=buf, mode="w") as tf:
+			for path, content in files:
+				try:
+					agent_path = self._normalize_upload_path_to_adjuntos(path)
+					real_path = self._resolve_workspace_path(agent_path)
+				except Exception:
+					# Invalid path: the per-file fallback reports it as that path's error.
+					return None
+				# real_path is always under the workspace (_resolve_workspace_path guarantees it): slice, no relpath().
+				member = real_path[len(self._workspace):].lstrip("/")
+				if not member:
+					# The workspace root itself is not a file; leave it to the per-file path as well.
+					return None
+				data = content if isinstance(content, bytes) else str(content).encode("utf-8")
+				info = tarfile.TarInfo(name=member)
+				info.size = len(data)
+				info.mode = 0o644
+				info.mtime = now
+				tf.addfile(info, io.BytesIO(data))
+				agent_paths.append(agent_path)
+		archive = f"/tmp/solven-upload-{uuid.uuid4().hex}.tar"
+		try:
+			# Hand the buffer itself to files.write (it accepts file objects): no extra copy of the whole archive.
+			buf.seek(0)
+			self._sandbox.files.write(archive, buf)
+			# Keep tar's exit code: the archive is removed either way, but a failed extract must not count as success.
+			result = self._sandbox.commands.run(
+				f"tar -xf {shlex.quote(archive)} -C {shlex.quote(self._workspace)} --no-same-owner; "
+				f"rc=$?; rm -f {shlex.quote(archive)}; exit $rc",
+				timeout=120,
+			)
+		except Exception as e:
+			logging.warning("_upload_batch_tar: %s", e)
+			return None
+		if result.exit_code != 0:
+			logging.warning("_upload_batch_tar: tar exited with %s", result.exit_code)
+			return None
+		return [FileUploadResponse(path=p, error=None) for p in agent_paths]
 
-			except Exception:
-				responses.append(FileUploadResponse(path=path, error="permission_denied"))
+	def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
+		self._ensure_initialized()
+		responses = self._upload_batch_tar(files) if len(files) > 1 else None
+		if responses is None and len(files) > 1:
+			# Per-file fallback: the writes are independent HTTPS round-trips, so overlap them (map keeps order).
+			with ThreadPoolExecutor(max_workers=min(_UPLOAD_CONCURRENCY, len(files))) as pool:
+				responses = list(pool.map(lambda item: self._upload_one(*item), files))
+		elif responses is None:
+			responses = [self._upload_one(path, content) for path, content in files]
 
 		if any(r.error is None for r in responses):
-			self._schedule_workspace_sync_to_s3()
+			self._schedule_workspace_sync_to_s3(incremental=True)
 
 		return responses
 
@@ -1038,14 +1793,13 @@ with open(p,"rb") as f:
 		self._ensure_initialized()
 		file_path = self._normalize_agent_path(file_path)
 
-		ext = (Path(file_path).suffix or "").lower()
 		# Block access to internal instructions.md files (consistent with parent semantics).
-		if file_path.endswith("/instructions.md") or file_path.endswith("instructions.md"):
+		if file_path.endswith("instructions.md"):
 			return "Error: File '{}' not found".format(file_path)
 
 		# Delegate all non-doc formats to deepagents BaseSandbox implementation.
 		# This avoids custom image embedding that can break OpenRouter multimodal schemas.
-		if ext not in _READ_AS_DOCUMENT_EXTENSIONS:
+		if not _is_document_path(file_path):
 			return super().read(file_path, offset, limit)
 
 		content, err = self._read_file_bytes_via_bwrap(file_path)
@@ -1057,13 +1811,11 @@ with open(p,"rb") as f:
 			return f"Error reading '{file_path}': {err}"
 
 		def _format_numbered_lines(text: str) -> str:
-			lines = text.splitlines()
-			start = offset
-			end = min(offset + limit, len(lines))
-			selected_lines = lines[start:end]
+			# Window lazily over the converted text: only the requested slice is materialized.
+			selected_lines = itertools.islice(io.StringIO(text), offset, offset + limit)
 			return "\n".join(
 				f"{i}\t{line}"
-				for i, line in enumerate(selected_lines, start=start + 1)
+				for i, line in enumerate((ln.rstrip("\r\n") for ln in selected_lines), start=offset + 1)
 			)
 
 		# Documents: convert to markdown (Word/PDF/etc).
@@ -1075,8 +1827,12 @@ with open(p,"rb") as f:
 
 	def write(self, file_path: str, content: str) -> WriteResult:
 		self._ensure_initialized()
-		out = super().write(self._normalize_agent_path(file_path), content)
-		self._schedule_workspace_sync_to_s3()
+		token = _SUPPRESS_EXECUTE_SYNC.set(True)
+		try:
+			out = super().write(self._normalize_agent_path(file_path), content)
+		finally:
+			_SUPPRESS_EXECUTE_SYNC.reset(token)
+		self._schedule_workspace_sync_to_s3(incremental=True)
 		return out
 
 	def edit(
@@ -1087,13 +1843,17 @@ with open(p,"rb") as f:
 		replace_all: bool = False,
 	) -> EditResult:
 		self._ensure_initialized()
-		out = super().edit(
-			self._normalize_agent_path(file_path),
-			old_string,
-			new_string,
-			replace_all=replace_all,
-		)
-		self._schedule_workspace_sync_to_s3()
+		token = _SUPPRESS_EXECUTE_SYNC.set(True)
+		try:
+			out = super().edit(
+				self._normalize_agent_path(file_path),
+				old_string,
+				new_string,
+				replace_all=replace_all,
+			)
+		finally:
+			_SUPPRESS_EXECUTE_SYNC.reset(token)
+		self._schedule_workspace_sync_to_s3(incremental=True)
 		return out
 
 	def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
@@ -1102,49 +1862,112 @@ with open(p,"rb") as f:
 		``/.solven/skills`` resolves via bind mounts, not ``_resolve_workspace_path``).
 		"""
 		self._ensure_initialized()
-		responses = []
-		for path in paths:
-			try:
-				content, err = self._read_file_bytes_via_bwrap(path)
-				if err == "file_not_found":
-					responses.append(FileDownloadResponse(path=path, content=None, error="file_not_found"))
-				elif err == "is_directory":
-					responses.append(FileDownloadResponse(path=path, content=None, error="is_directory"))
-				elif err:
-					responses.append(FileDownloadResponse(path=path, content=None, error=err))
-				else:
-					responses.append(FileDownloadResponse(path=path, content=content, error=None))
-			except Exception as e:
-				responses.append(
-					FileDownloadResponse(path=path, content=None, error=f"download_error: {str(e)}")
-				)
+		norms, known_missing, to_read, generation = self._plan_download(paths)
+		return self._download_responses(
+			paths, norms, known_missing, self._read_files_bytes_chunked(to_read), generation,
+		)
 
-		return responses
+	def _plan_download(self, paths: list[str]) -> tuple[list[str], set[str], list[str], int]:
+		"""Split a download into normalized paths, known-missing ones, paths still to read and the cache generation."""
+		# Paths that were missing a moment ago (agents re-probe .env, config files...) skip the sandbox round-trip.
+		# Misses are forgotten by every invalidation, i.e. after each execute and each write, edit or upload.
+		now = _time.monotonic()
+		norms = [self._normalize_agent_path(p) for p in paths]
+		with self._search_cache_lock:
+			generation = self._search_cache_generation
+			known_missing = {
+				n for n in norms
+				if now - self._missing_paths.get(n, float("-inf")) < _SEARCH_CACHE_TTL_SEC
+			}
+		to_read = [p for p, n in zip(paths, norms) if n not in known_missing]
+		return norms, known_missing, to_read, generation
+
+	def _download_responses(
+		self,
+		paths: list[str],
+		norms: list[str],
+		known_missing: set[str],
+		read: list[tuple[bytes | None, str | None]],
+		generation: int,
+	) -> list[FileDownloadResponse]:
+		"""Merge reader results (one per ``to_read`` path) back into request order and remember new misses."""
+		# Misses are not remembered when the workspace may have changed since the read started (see _plan_download).
+		now = _time.monotonic()
+		read_iter = iter(read)
+		results: list[tuple[bytes | None, str | None]] = []
+		new_missing: list[str] = []
+		for n in norms:
+			if n in known_missing:
+				results.append((None, "file_not_found"))
+				continue
+			content, err = next(read_iter)
+			if err == "file_not_found":
+				new_missing.append(n)
+			results.append((content, err))
+		if new_missing:
+			with self._search_cache_lock:
+				if generation == self._search_cache_generation:
+					self._missing_paths.update(dict.fromkeys(new_missing, now))
+		return [
+			FileDownloadResponse(path=path, content=None if err else content, error=err)
+			for path, (content, err) in zip(paths, results)
+		]
 
 	async def aupload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
-		"""Async version of upload_files."""
-		return await asyncio.to_thread(self.upload_files, files)
+		"""Async version of upload_files: one tar batch, or concurrent per-file writes (bounded by _UPLOAD_CONCURRENCY) as fallback."""
+		await self._await_pending_init()
+		await _run_in_io_pool(self._ensure_initialized)
+		responses = await _run_in_io_pool(self._upload_batch_tar, files) if len(files) > 1 else None
+		if responses is None:
+			semaphore = asyncio.Semaphore(_UPLOAD_CONCURRENCY)
+
+			async def upload(path: str, content: bytes) -> FileUploadResponse:
+				async with semaphore:
+					return await _run_in_io_pool(self._upload_one, path, content)
+
+			responses = list(await asyncio.gather(*(upload(p, c) for p, c in files)))
+		if any(r.error is None for r in responses):
+			# Scheduling is itself a (background) commands.run RPC: keep it off the event loop.
+			await _run_in_io_pool(self._schedule_workspace_sync_to_s3, True)
+		return responses
 
 	async def adownload_files(self, paths: list[str]) -> list[FileDownloadResponse]:
-		"""Async version of download_files."""
-		return await asyncio.to_thread(self.download_files, paths)
+		"""Async version of download_files: chunks are awaited side by side on the I/O pool."""
+		# Bounded by _DOWNLOAD_CONCURRENCY, rather than fanned out from a pool thread blocked on its own executor.
+		await self._await_pending_init()
+		await _run_in_io_pool(self._ensure_initialized)
+		norms, known_missing, to_read, generation = self._plan_download(paths)
+		semaphore = asyncio.Semaphore(_DOWNLOAD_CONCURRENCY)
+
+		async def read(chunk: list[str]) -> list[tuple[bytes | None, str | None]]:
+			async with semaphore:
+				return await _run_in_io_pool(self._read_chunk, chunk)
+
+		parts = await asyncio.gather(*(read(chunk) for chunk in _download_chunks(to_read)))
+		return self._download_responses(
+			paths, norms, known_missing, [r for part in parts for r in part], generation,
+		)
 
 	async def als_info(self, path: str) -> list[FileInfo]:
-		return await asyncio.to_thread(self.ls_info, path)
+		await self._await_pending_init()
+		return await _run_in_io_pool(self.ls_info, path)
 
 	async def aread(self, file_path: str, offset: int = 0, limit: int = 2000) -> str:
+		await self._await_pending_init()
 		norm = self._normalize_agent_path(file_path)
-		ext = (Path(norm).suffix or "").lower()
-		if ext not in _READ_AS_DOCUMENT_EXTENSIONS:
+		if not _is_document_path(norm):
 			# Bypass our document override; use BaseSandbox read (images / multimodal).
-			return await asyncio.to_thread(super().read, norm, offset, limit)
-		return await asyncio.to_thread(self.read, file_path, offset, limit)
+			return await _run_in_io_pool(super().read, norm, offset, limit)
+		return await _run_in_io_pool(self.read, file_path, offset, limit)
 
 	async def awrite(self, file_path: str, content: str) -> WriteResult:
-		return await asyncio.to_thread(self.write, file_path, content)
+		await self._await_pending_init()
+		return await _run_in_io_pool(self.write, file_path, content)
 
 	async def agrep_raw(self, pattern: str, path: str | None, glob: str | None = None) -> list[GrepMatch] | str:
-		return await asyncio.to_thread(self.grep_raw, pattern, path, glob)
+		await self._await_pending_init()
+		return await _run_in_io_pool(self.grep_raw, pattern, path, glob)
 
 	async def aglob_info(self, pattern: str, path: str) -> list[FileInfo]:
-		return await asyncio.to_thread(self.glob_info, pattern, path)
+		await self._await_pending_init()
+		return await _run_in_io_pool(self.glob_info, pattern, path)
@@ -1,10 +1,9 @@
 
 from typing import Dict, Any
-import re
-import yaml
 
 from langgraph.graph.state import RunnableConfig
 from src.models import AppContext
+from src.utils import _SKILLMD_FRONTMATTER_RE
 
 def parse_skillmd_frontmatter(skillmd: str) -> str:
     """
@@ -23,8 +22,7 @@ def parse_skillmd_frontmatter(skillmd: str) -> str:
         The frontmatter string (content between --- delimiters), or empty string if not found
     """
     # Match YAML frontmatter between --- delimiters at the start of the file
-    frontmatter_pattern = r'^---\s*\n(.*?)\n---\s*\n'
-    match = re.match(frontmatter_pattern, skillmd, re.DOTALL)
+    match = _SKILLMD_FRONTMATTER_RE.match(skillmd)
     
     if not match:
         return ""
@@ -1,4 +1,9 @@
+import re
+
 from .tickets import get_ticket
 
+# YAML frontmatter between --- delimiters at the start of a SKILL.md (compiled once; parsed for every listed skill).
+_SKILLMD_FRONTMATTER_RE = re.compile(r'^---\s*\n(.*?)\n---\s*\n', re.DOTALL)
+
 __all__ = ['get_ticket']
 
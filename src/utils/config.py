@@ -29,7 +29,8 @@ get_user_info_by_id(user_id, company_id) -> dict  (Supabase enrichment)
 
 from __future__ import annotations
 
-import os
+import asyncio
+from contextvars import ContextVar
 from typing import Any, Optional
 
 from pydantic import BaseModel, Field, ConfigDict
@@ -56,6 +57,11 @@ class UserContext(BaseModel):
     is_creator: bool = Field(False, alias="isCreator")
 
 
+# Last (configurable.user dict, parsed UserContext) seen in this context. The dict is passed along by
+# reference for the whole run, so an identity match means it has already been validated.
+_PARSED_USER: ContextVar[tuple[dict, UserContext] | None] = ContextVar("parsed_user", default=None)
+
+
 # ── Core helpers ────────────────────────────────────────────────────────────
 
 def get_user() -> UserContext:
@@ -75,7 +81,12 @@ def get_user() -> UserContext:
         # ── Path 1: new full user object ─────────────────────────────────
         user_obj = configurable.get("user")
         if isinstance(user_obj, dict) and user_obj.get("id"):
-            return UserContext.model_validate(user_obj)
+            parsed = _PARSED_USER.get()
+            if parsed is not None and parsed[0] is user_obj:
+                return parsed[1]
+            user = UserContext.model_validate(user_obj)
+            _PARSED_USER.set((user_obj, user))
+            return user
 
         # ── Path 2: legacy header-derived keys ───────────────────────────
         user_id = configurable.get("x-user-id")
@@ -201,10 +212,7 @@ async def get_user_info_by_id(user_id: str, company_id: Optional[str] = None) ->
     Queries the ``clients`` table for contact details (full_name, phone, address)
     and optionally the ``companies`` table for the company name.
     """
-    from supabase import create_async_client
-
-    supabase_url = os.getenv("SUPABASE_URL", "")
-    supabase_key = os.getenv("SUPABASE_SECRET_KEY", "")
+    from src.utils.supabase_client import get_supabase
 
     result: dict = {
         "full_name": "",
@@ -215,15 +223,28 @@ async def get_user_info_by_id(user_id: str, company_id: Optional[str] = None) ->
     }
 
     try:
-        supabase = await create_async_client(supabase_url, supabase_key)
+        supabase = await get_supabase()
 
-        client_resp = (
-            await supabase.table("clients")
+        # The two lookups are independent: run them concurrently
+        client_query = (
+            supabase.table("clients")
             .select("full_name, email, phone, address")
             .eq("user_id", user_id)
             .limit(1)
             .execute()
         )
+        if company_id:
+            company_query = (
+                supabase.table("companies")
+                .select("name")
+                .eq("id", company_id)
+                .limit(1)
+                .execute()
+            )
+            client_resp, company_resp = await asyncio.gather(client_query, company_query)
+        else:
+            client_resp, company_resp = await client_query, None
+
         if client_resp.data:
             record = client_resp.data[0]
             result["full_name"] = record.get("full_name") or ""
@@ -231,16 +252,8 @@ async def get_user_info_by_id(user_id: str, company_id: Optional[str] = None) ->
             result["phone"] = record.get("phone") or ""
             result["address"] = record.get("address") or ""
 
-        if company_id:
-            company_resp = (
-                await supabase.table("companies")
-                .select("name")
-                .eq("id", company_id)
-                .limit(1)
-                .execute()
-            )
-            if company_resp.data:
-                result["company_name"] = company_resp.data[0].get("name") or ""
+        if company_resp is not None and company_resp.data:
+            result["company_name"] = company_resp.data[0].get("name") or ""
 
     except Exception as e:
         print(f"[get_user_info_by_id] Exception: {e}", flush=True)
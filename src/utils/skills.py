@@ -1,6 +1,15 @@
 """
 Utility functions for skill matching and management.
 """
+import asyncio
+import functools
+import hashlib
+import heapq
+import itertools
+import re
+import time
+import unicodedata
+from collections import Counter, OrderedDict, defaultdict
 from typing import List, Literal
 from pydantic import BaseModel, Field, field_validator
 from langchain_core.prompts import ChatPromptTemplate
@@ -40,37 +49,9 @@ def create_skill_match_result_model(available_skill_names: List[str]):
 	return SkillMatchResult
 
 
-async def match_skills_with_conversation(skills: List[Skill], conversation_text: str) -> List[Skill]:
-	"""
-	Match skills with conversation context using an LLM agent with structured output.
-	The agent analyzes the conversation history and selects relevant skills.
-	
-	Args:
-		skills: List of available skills to match against
-		conversation_text: Combined text from recent conversation messages
-		
-	Returns:
-		List of matched skills sorted by relevance (max 3)
-	"""
-	if not skills:
-		return []
-	
-	try:
-		# Extract skill names for Literal type constraint
-		available_skill_names = [s.name for s in skills]
-		
-		# Create dynamic model with Literal constraints
-		SkillMatchResult = create_skill_match_result_model(available_skill_names)
-		
-		# Build formatted list of available skills
-		skills_list = "\n".join([
-			f"{i+1}. **{s.name}**: {s.description}"
-			for i, s in enumerate(skills)
-		])
-		
-		# Create prompt for the agent
-		prompt = ChatPromptTemplate.from_messages([
-			("system", """Eres un agente especializado en analizar conversaciones y seleccionar las habilidades más relevantes para el contexto.
+# Prompt of the skill-matching agent (static: the skill list and conversation are template variables).
+_SKILL_MATCH_PROMPT = ChatPromptTemplate.from_messages([
+	("system", """Eres un agente especializado en analizar conversaciones y seleccionar las habilidades más relevantes para el contexto.
 
 Tu tarea es analizar el historial de conversación y determinar qué habilidades deberían cargarse para ayudar al usuario.
 
@@ -79,7 +60,7 @@ Habilidades disponibles:
 
 IMPORTANTE: 
 - Solo puedes seleccionar nombres de habilidades que aparezcan EXACTAMENTE en la lista anterior
-- Los nombres disponibles son: {skill_names}
+- Usa los nombres que aparecen en negrita arriba
 - Analiza el contexto completo de la conversación, no solo el último mensaje
 - Considera la intención general y el flujo de la conversación
 
@@ -89,29 +70,106 @@ Instrucciones:
 - Solo selecciona habilidades que sean claramente relevantes para el contexto actual
 - Si ninguna habilidad es relevante, devuelve una lista vacía
 - Usa EXACTAMENTE los nombres de las habilidades tal como aparecen en la lista"""),
-			("human", """Contexto de la conversación (últimos mensajes):
+	("human", """Contexto de la conversación (últimos mensajes):
 
 {conversation_context}
 
 ¿Qué habilidades deberían cargarse basándose en este contexto de conversación?""")
-		])
+])
+
+
+@functools.lru_cache(maxsize=128)
+def _skill_match_chain(available_skill_names: tuple[str, ...]):
+	"""Prompt | structured-output LLM for one skill-name set. The pydantic model and its JSON schema are built once per set."""
+	SkillMatchResult = create_skill_match_result_model(list(available_skill_names))
+	return _SKILL_MATCH_PROMPT | LLM_SKILL_MATCHING.with_structured_output(SkillMatchResult)
+
+
+# Deadline for the LLM skill match; the keyword match (microseconds) answers when it is exceeded.
+_SKILL_MATCH_LLM_TIMEOUT_SEC = 3.0
+
+
+# LLM skill-match results (matched skill names) by hash of the skill catalog + conversation text. Exact-match only:
+# repeated or re-sent conversations skip the LLM round-trip. Entries expire after the TTL.
+_SKILL_MATCH_CACHE: OrderedDict[str, tuple[float, tuple[str, ...]]] = OrderedDict()
+_SKILL_MATCH_CACHE_MAXSIZE = 512
+_SKILL_MATCH_CACHE_TTL_SEC = 600.0
+
+
+def _skill_match_cache_key(skills_list: str, conversation_text: str) -> str:
+	return hashlib.sha256(f"{skills_list}\0{conversation_text}".encode()).hexdigest()
+
+
+def _skill_match_cache_get(key: str) -> tuple[str, ...] | None:
+	entry = _SKILL_MATCH_CACHE.get(key)
+	if entry is None:
+		return None
+	stored_at, names = entry
+	if time.monotonic() - stored_at > _SKILL_MATCH_CACHE_TTL_SEC:
+		del _SKILL_MATCH_CACHE[key]
+		return None
+	_SKILL_MATCH_CACHE.move_to_end(key)
+	return names
+
+
+def _skill_match_cache_put(key: str, names: tuple[str, ...]) -> None:
+	_SKILL_MATCH_CACHE[key] = (time.monotonic(), names)
+	_SKILL_MATCH_CACHE.move_to_end(key)
+	while len(_SKILL_MATCH_CACHE) > _SKILL_MATCH_CACHE_MAXSIZE:
+		_SKILL_MATCH_CACHE.popitem(last=False)
+
+
+async def match_skills_with_conversation(skills: List[Skill], conversation_text: str) -> List[Skill]:
+	"""
+	Match skills with conversation context using an LLM agent with structured output.
+	The agent analyzes the conversation history and selects relevant skills.
+	
+	Args:
+		skills: List of available skills to match against
+		conversation_text: Combined text from recent conversation messages
 		
-		# Create structured output chain with constrained model
-		structured_llm = LLM_SKILL_MATCHING.with_structured_output(SkillMatchResult)
-		chain = prompt | structured_llm
+	Returns:
+		List of matched skills sorted by relevance (max 3)
+	"""
+	if not skills:
+		return []
+	
+	try:
+		# Only the recent turns and the most plausible skills go into the prompt
+		conversation_text = _recent_conversation(conversation_text)
+		candidates = _prompt_skill_candidates(skills, conversation_text)
+		if not candidates:
+			# No skill shares a single keyword with the conversation: nothing for the LLM to pick from
+			return []
+		
+		# Extract skill names for Literal type constraint
+		available_skill_names = [s.name for s in candidates]
+		
+		# Build formatted list of available skills
+		skills_list = "\n".join([
+			f"{i+1}. **{s.name}**: {s.description}"
+			for i, s in enumerate(candidates)
+		])
 		
-		# Get LLM response
-		result: SkillMatchResult = await chain.ainvoke({
-			"skills_list": skills_list,
-			"skill_names": ", ".join(available_skill_names),
-			"conversation_context": conversation_text
-		})
+		# Get LLM response (or the cached names for the same catalog and conversation)
+		cache_key = _skill_match_cache_key(skills_list, conversation_text)
+		matched_names = _skill_match_cache_get(cache_key)
+		if matched_names is None:
+			# Structured output chain with the model constrained to these skill names
+			chain = _skill_match_chain(tuple(available_skill_names))
+			# Past the deadline the LLM call is cancelled and the keyword fallback below answers instead
+			result = await asyncio.wait_for(chain.ainvoke({
+				"skills_list": skills_list,
+				"conversation_context": conversation_text
+			}), timeout=_SKILL_MATCH_LLM_TIMEOUT_SEC)
+			matched_names = tuple(result.matched_skill_names)
+			_skill_match_cache_put(cache_key, matched_names)
 		
 		# Map skill names back to Skill objects (validation already done in model)
-		skill_map = {s.name: s for s in skills}
+		skill_map = {s.name: s for s in candidates}
 		matched_skills = []
 		
-		for skill_name in result.matched_skill_names:
+		for skill_name in matched_names:
 			if skill_name in skill_map:
 				matched_skills.append(skill_map[skill_name])
 		
@@ -125,32 +183,72 @@ Instrucciones:
 def match_skills_with_keywords(skills: List[Skill], message: str) -> List[Skill]:
 	"""
 	Fallback keyword-based skill matching when LLM fails.
-	Matches skills based on keyword presence in skill name/description.
+	Scores each skill by how many of its name/description words (4+ letters, stemmed) appear in the message.
 	"""
-	message_lower = message.lower()
-	matched = []
+	scores = _keyword_scores(skills, message)
 	
-	# Extract keywords from message (simple approach)
-	# Look for common skill-related keywords
-	for skill in skills:
-		# Extract key terms from skill name (split by hyphens)
-		skill_keywords = skill.name.replace('-', ' ').split()
-		# Also use description keywords
-		desc_keywords = skill.description.lower().split()
-		
-		# Check if any keywords match
-		score = 0
-		for keyword in skill_keywords + desc_keywords:
-			if len(keyword) > 3 and keyword.lower() in message_lower:
-				score += 1
-		
-		if score > 0:
-			matched.append((score, skill))
-	
-	# Sort by score and return top matches
-	matched.sort(key=lambda x: x[0], reverse=True)
-	result = [skill for score, skill in matched[:3]]
-	
-	
-	return result
+	# Top matches by score (ties keep skill order)
+	top = heapq.nlargest(3, sorted(scores.items()), key=lambda x: x[1])
+	return [skills[i] for i, _ in top]
+
+
+# The LLM matcher sees at most this many trailing characters of the conversation (cut back to a line boundary)
+# and at most this many skills (the best keyword scores among those with any hit, kept in catalog order).
+_MAX_CONVERSATION_CHARS = 4000
+_MAX_PROMPT_SKILLS = 20
+
+
+def _recent_conversation(conversation_text: str) -> str:
+	if len(conversation_text) <= _MAX_CONVERSATION_CHARS:
+		return conversation_text
+	tail = conversation_text[-_MAX_CONVERSATION_CHARS:]
+	newline = tail.find("\n")
+	return tail[newline + 1:] if 0 <= newline < len(tail) - 1 else tail
+
+
+def _prompt_skill_candidates(skills: List[Skill], conversation_text: str) -> List[Skill]:
+	"""Skills offered to the LLM: the best-scored ones with any keyword hit, in catalog order."""
+	# At most _MAX_PROMPT_SKILLS; empty when no skill matches any keyword.
+	scores = _keyword_scores(skills, conversation_text)
+	keep = heapq.nlargest(_MAX_PROMPT_SKILLS, sorted(scores), key=scores.__getitem__)
+	return [skills[i] for i in sorted(keep)]
+
+
+def _keyword_scores(skills: List[Skill], message: str) -> Counter[int]:
+	"""Skill position -> number of its keywords found in the message (skills without hits are absent)."""
+	index = _keyword_index(tuple((s.name, s.description) for s in skills))
+	# One Counter over the concatenated posting lists: the counting loop runs in C (collections._count_elements)
+	return Counter(itertools.chain.from_iterable(index.get(token, ()) for token in _keyword_tokens(message)))
+
+
+# Words of 4+ letters (accented letters included: descriptions and messages are in Spanish)
+_KEYWORD_RE = re.compile(r"[^\W\d_]{4,}")
+
+
+@functools.lru_cache(maxsize=4096)
+def _keyword_stem(word: str) -> str:
+	"""Crude stem of a case-folded word, so inflections meet: facturas/factura, acciones/acción, inmuebles/inmueble."""
+	# Accents dropped (NFKD splits them into combining marks), then a plural "s" and a final vowel
+	word = "".join(c for c in unicodedata.normalize("NFKD", word) if not unicodedata.combining(c))
+	if word.endswith("s"):
+		word = word[:-1]
+	if word[-1:] in ("a", "e", "o"):
+		word = word[:-1]
+	return word
+
+
+def _keyword_tokens(text: str) -> frozenset[str]:
+	"""Distinct keyword stems of text, case-folded (Unicode-aware, so accented and non-Latin text compares caselessly)."""
+	return frozenset(map(_keyword_stem, _KEYWORD_RE.findall(text.casefold())))
+
+
+@functools.lru_cache(maxsize=16)
+def _keyword_index(catalog: tuple[tuple[str, str], ...]) -> dict[str, tuple[int, ...]]:
+	"""Inverted index keyword -> positions of the skills that have it, built once per skill catalog."""
+	# Scoring then walks only the message's tokens instead of every skill's keyword set.
+	index: dict[str, list[int]] = defaultdict(list)
+	for i, (name, description) in enumerate(catalog):
+		for token in _keyword_tokens(f"{name.replace('-', ' ')} {description}"):
+			index[token].append(i)
+	return {token: tuple(positions) for token, positions in index.items()}
 
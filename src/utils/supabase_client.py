@@ -0,0 +1,33 @@
+"""Shared async Supabase client (service key), one per event loop."""
+import asyncio
+import os
+import weakref
+
+from dotenv import load_dotenv
+from supabase import AsyncClient, create_async_client
+
+load_dotenv()
+
+SUPABASE_URL = os.environ.get("SUPABASE_URL")
+SUPABASE_SERVICE_KEY = os.environ.get("SUPABASE_SECRET_KEY")
+
+# One client (HTTP connection pool + auth setup) per event loop instead of per call. Keyed by loop because
+# graph nodes run on different loops and an httpx pool cannot be used from a loop other than its own.
+_supabase_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncClient]" = weakref.WeakKeyDictionary()
+# Per-loop locks, so concurrent first calls on a loop don't each build (and leak) their own client.
+_supabase_client_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def get_supabase() -> AsyncClient:
+    """Get or create the running loop's shared async Supabase client (service key)."""
+    loop = asyncio.get_running_loop()
+    client = _supabase_clients.get(loop)
+    if client is None:
+        lock = _supabase_client_locks.setdefault(loop, asyncio.Lock())
+        async with lock:
+            client = _supabase_clients.get(loop)
+            if client is None:
+                client = _supabase_clients[loop] = await create_async_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+    return client
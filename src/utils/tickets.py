@@ -1,15 +1,25 @@
-from dotenv import load_dotenv
-import os
+import logging
 from typing import Optional
 from datetime import datetime, timezone
 
-from supabase import create_async_client
+from postgrest.exceptions import APIError
 from src.models import Ticket
+from src.utils.supabase_client import get_supabase
 
-load_dotenv()
+# Select that embeds the ticket's document through the tickets.document_id -> documents.id foreign key,
+# so the ticket and its content come back in one round-trip. Cleared if PostgREST rejects the embed.
+_TICKET_WITH_DOCUMENT_SELECT: str | None = "*, documents(content)"
 
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_SECRET = os.getenv("SUPABASE_SECRET_KEY")
+def _embedded_document_content(ticket_data: dict) -> str | None:
+    """Content of the document embedded by _TICKET_WITH_DOCUMENT_SELECT (object, or list if the relation is to-many)."""
+    document = ticket_data.pop("documents", None)
+    if isinstance(document, list):
+        document = document[0] if document else None
+    return document.get("content") if document else None
+
+def _parse_timestamp(value: str | None) -> datetime:
+    """Postgres timestamptz string -> datetime (C-implemented ``fromisoformat``); now (UTC) when missing."""
+    return datetime.fromisoformat(value) if value else datetime.now(timezone.utc)
 
 async def get_ticket(thread_id: str) -> Optional[Ticket]:
     """
@@ -24,46 +34,63 @@ async def get_ticket(thread_id: str) -> Optional[Ticket]:
     """
     try:
         if not thread_id:
-            print(f"[get_ticket] No thread_id provided", flush=True)
+            logging.debug("[get_ticket] No thread_id provided")
             return None
         
-        print(f"[get_ticket] Loading ticket for thread_id: {thread_id}", flush=True)
-        supabase = await create_async_client(SUPABASE_URL, SUPABASE_SECRET)
+        logging.debug("[get_ticket] Loading ticket for thread_id: %s", thread_id)
+        global _TICKET_WITH_DOCUMENT_SELECT
+        supabase = await get_supabase()
         
-        # Fetch ticket from database using thread_id (which is the ticket ID)
-        response = await supabase.table("tickets").select("*").eq("id", thread_id).execute()
+        # Fetch ticket (and its document, when the embed is available) using thread_id (which is the ticket ID)
+        embedded = _TICKET_WITH_DOCUMENT_SELECT is not None
+        if embedded:
+            try:
+                response = await supabase.table("tickets").select(_TICKET_WITH_DOCUMENT_SELECT).eq("id", thread_id).execute()
+            except APIError as e:
+                logging.warning("[get_ticket] Document embed rejected, falling back to separate queries: %s", e)
+                _TICKET_WITH_DOCUMENT_SELECT = None
+                embedded = False
+        if not embedded:
+            response = await supabase.table("tickets").select("*").eq("id", thread_id).execute()
         
         if not response.data or len(response.data) == 0:
-            print(f"[get_ticket] No ticket found for thread_id: {thread_id}", flush=True)
+            logging.debug("[get_ticket] No ticket found for thread_id: %s", thread_id)
             return None
         
         ticket_data = response.data[0]
-        print(f"[get_ticket] Ticket found: {ticket_data.get('id')} - {ticket_data.get('title', 'No title')}", flush=True)
+        logging.debug("[get_ticket] Ticket found: %s - %s", ticket_data.get("id"), ticket_data.get("title", "No title"))
         
         # Get documentId from ticket
         document_id = ticket_data.get("document_id") or ticket_data.get("documentId")
         
         # Load document content from documents table if documentId exists
         description = ticket_data.get("description", "")
-        if document_id:
-            print(f"[get_ticket] Loading document for documentId: {document_id}", flush=True)
+        if embedded:
+            document_content = _embedded_document_content(ticket_data)
+            if document_content:
+                logging.debug("[get_ticket] Document content loaded successfully (%d chars), injecting into ticket description", len(document_content))
+                description = document_content
+            else:
+                logging.debug("[get_ticket] No document content for ticket, using ticket description")
+        elif document_id:
+            logging.debug("[get_ticket] Loading document for documentId: %s", document_id)
             try:
                 doc_response = await supabase.table("documents").select("content").eq("id", document_id).execute()
                 if doc_response.data and len(doc_response.data) > 0:
                     document_content = doc_response.data[0].get("content", "")
                     if document_content:
-                        print(f"[get_ticket] Document content loaded successfully ({len(document_content)} chars), injecting into ticket description", flush=True)
+                        logging.debug("[get_ticket] Document content loaded successfully (%d chars), injecting into ticket description", len(document_content))
                         # Inject document content into description
                         description = document_content
                     else:
-                        print(f"[get_ticket] Document found but content is empty, using ticket description", flush=True)
+                        logging.debug("[get_ticket] Document found but content is empty, using ticket description")
                 else:
-                    print(f"[get_ticket] No document found for documentId: {document_id}, using ticket description", flush=True)
+                    logging.debug("[get_ticket] No document found for documentId: %s, using ticket description", document_id)
             except Exception as e:
-                print(f"[get_ticket] Warning: Failed to load document {document_id}: {e}", flush=True)
+                logging.warning("[get_ticket] Failed to load document %s: %s", document_id, e)
                 # Continue with original description if document load fails
         else:
-            print(f"[get_ticket] No documentId found in ticket, using ticket description", flush=True)
+            logging.debug("[get_ticket] No documentId found in ticket, using ticket description")
         
         # Build Ticket model from database data
         ticket = Ticket(
@@ -72,14 +99,12 @@ async def get_ticket(thread_id: str) -> Optional[Ticket]:
             description=description,  # Use document content if available, otherwise use ticket description
             related_threads=ticket_data.get("related_threads", []),
             status=ticket_data.get("status", "open"),
-            updated_at=datetime.fromisoformat(ticket_data.get("updated_at")) if ticket_data.get("updated_at") else datetime.now(timezone.utc)
+            updated_at=_parse_timestamp(ticket_data.get("updated_at"))
         )
         
-        print(f"[get_ticket] Ticket loaded successfully: {ticket.id} - Description length: {len(ticket.description)} chars", flush=True)
+        logging.debug("[get_ticket] Ticket loaded successfully: %s - Description length: %d chars", ticket.id, len(ticket.description))
         return ticket
         
     except Exception as e:
-        print(f"[get_ticket] Error loading ticket for thread_id {thread_id}: {e}", flush=True)
-        import traceback
-        print(f"[get_ticket] Traceback: {traceback.format_exc()}", flush=True)
+        logging.exception("[get_ticket] Error loading ticket for thread_id %s: %s", thread_id, e)
         return None
@@ -1,18 +1,17 @@
+import asyncio
 import os
-from typing import Optional
+import weakref
 from dotenv import load_dotenv
 
-from supabase import create_async_client
-from langchain_postgres import PGVectorStore, PGEngine
-from sqlalchemy.ext.asyncio import create_async_engine
+from langchain_postgres import PGEngine, PGVectorStore
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 
 from src.embeddings import embeddings
+from src.utils.supabase_client import get_supabase
 
 load_dotenv()
 
-SUPABASE_URL = os.environ.get("SUPABASE_URL")
-SUPABASE_SERVICE_KEY = os.environ.get("SUPABASE_SECRET_KEY")
-
 def _get_database_url() -> str:
     """Get DATABASE_URL from environment and ensure it uses asyncpg driver."""
     database_url = os.environ.get("DATABASE_URL")
@@ -29,17 +28,21 @@ def _get_database_url() -> str:
     
     return database_url
 
-# Global PGEngine instance (connection pool)
-_pg_engine: Optional[PGEngine] = None
+# PGEngine (connection pool) per event loop: an asyncpg pool cannot be used from a loop other than its own,
+# and graph nodes run on different loops (same reasoning as utils/supabase_client.py).
+_pg_engines: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, PGEngine]" = weakref.WeakKeyDictionary()
+# SQLAlchemy engine behind each loop's PGEngine, for queries PGVectorStore cannot express
+_async_engines: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncEngine]" = weakref.WeakKeyDictionary()
 
 async def get_pg_engine() -> PGEngine:
-    """Get or create PGEngine instance with connection pool.
+    """Get or create the running loop's PGEngine instance with connection pool.
     
     Following LangChain PGVectorStore documentation:
     https://docs.langchain.com/oss/python/integrations/vectorstores/pgvectorstore
     """
-    global _pg_engine
-    if _pg_engine is None:
+    loop = asyncio.get_running_loop()
+    pg_engine = _pg_engines.get(loop)
+    if pg_engine is None:
         # Get DATABASE_URL from environment (read fresh each time)
         database_url = _get_database_url()
         
@@ -47,12 +50,75 @@ async def get_pg_engine() -> PGEngine:
         engine = create_async_engine(database_url)
         
         # Create PGEngine from engine
-        _pg_engine = PGEngine.from_engine(engine=engine)
+        pg_engine = _pg_engines[loop] = PGEngine.from_engine(engine=engine)
+        _async_engines[loop] = engine
         
         # Note: We don't initialize the table here because it already exists
         # with our custom schema (id, content, metadata, embedding)
     
-    return _pg_engine
+    return pg_engine
+
+# PGVectorStore over the documents table, per event loop like its engine (PGVectorStore.create introspects the
+# table on every call). The per-loop locks keep concurrent first calls on a loop from each building one.
+_vector_stores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, PGVectorStore]" = weakref.WeakKeyDictionary()
+_vector_store_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+async def get_vector_store() -> PGVectorStore:
+    """Get or create the running loop's PGVectorStore for the documents table, built once with its custom schema.
+
+    Our table has: id, content, metadata, embedding (not langchain_id/langchain_metadata).
+    """
+    loop = asyncio.get_running_loop()
+    vector_store = _vector_stores.get(loop)
+    if vector_store is None:
+        async with _vector_store_locks.setdefault(loop, asyncio.Lock()):
+            vector_store = _vector_stores.get(loop)
+            if vector_store is None:
+                vector_store = _vector_stores[loop] = await PGVectorStore.create(
+                    engine=await get_pg_engine(),
+                    table_name="documents",
+                    embedding_service=embeddings,
+                    # Map to existing column names
+                    id_column="id",
+                    content_column="content",
+                    embedding_column="embedding",
+                    metadata_json_column="metadata",
+                )
+    return vector_store
+
+# Cosine-distance search over ticket descriptions of one company. The metadata filter runs in SQL, so exactly k
+# matching rows come back (PGVectorStore filters only address real columns, not keys of the metadata JSON column).
+_TICKET_VECTOR_SEARCH_SQL = text("""
+    SELECT content,
+           metadata->>'ticket_id' AS ticket_id,
+           metadata->>'title' AS title,
+           metadata->>'customer_email' AS customer_email,
+           metadata->>'priority' AS priority,
+           cosine_distance(embedding, :query_embedding) AS distance
+    FROM documents
+    WHERE metadata->>'company_id' = :company_id AND metadata->>'type' = 'ticket_description'
+    ORDER BY embedding <=> :query_embedding
+    LIMIT :k
+""")
+
+async def _vector_search_tickets(query: str, company_id: str, k: int) -> list:
+    """Top-k ticket description rows of the company by cosine distance to the query embedding."""
+    query_embedding = await embeddings.aembed_query(query)
+    await get_pg_engine()
+    async with _async_engines[asyncio.get_running_loop()].connect() as conn:
+        result = await conn.execute(
+            _TICKET_VECTOR_SEARCH_SQL,
+            {"query_embedding": str([float(x) for x in query_embedding]), "company_id": company_id, "k": k},
+        )
+        return list(result.mappings())
+
+async def _ticket_statuses(supabase_async, ticket_ids: list) -> dict:
+    """Map ticket id -> status for all given ids in one ``IN`` query (instead of one query per ticket)."""
+    ids = list({ticket_id for ticket_id in ticket_ids if ticket_id})
+    if not ids:
+        return {}
+    rows = await supabase_async.table("tickets").select("id, status").in_("id", ids).execute()
+    return {row["id"]: row["status"] for row in rows.data or []}
 
 async def search(
     query: str,
@@ -62,8 +128,8 @@ async def search(
     """
     Search for similar tickets using vector search with fallback to text search.
     
-    Uses PGVectorStore following LangChain documentation:
-    https://docs.langchain.com/oss/python/integrations/vectorstores/pgvectorstore
+    Vector search runs one SQL query over the documents table written by PGVectorStore, with the
+    company/type metadata filter applied in SQL (see _TICKET_VECTOR_SEARCH_SQL).
     
     Args:
         query: Search query text
@@ -84,57 +150,26 @@ async def search(
         query = query[:MAX_QUERY_LENGTH].rsplit(' ', 1)[0]  # Truncate at word boundary
     
     try:
-        supabase_async = await create_async_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+        supabase_async = await get_supabase()
         
-        # Try vector search first using PGVectorStore
+        # Try vector search first
         try:
-            # Get PGEngine instance
-            pg_engine = await get_pg_engine()
-            
-            # Create PGVectorStore instance using existing table schema
-            # Our table has: id, content, metadata, embedding (not langchain_id/langchain_metadata)
-            # Following LangChain docs for custom table schema:
-            # https://docs.langchain.com/oss/python/integrations/vectorstores/pgvectorstore#create-a-vector-store-using-existing-table
-            vector_store = await PGVectorStore.create(
-                engine=pg_engine,
-                table_name="documents",
-                embedding_service=embeddings,
-                # Map to existing column names
-                id_column="id",  # Our table uses "id" not "langchain_id"
-                content_column="content",
-                embedding_column="embedding",
-                metadata_json_column="metadata",  # Our table uses "metadata" not "langchain_metadata"
-            )
-            
-            # Perform similarity search with relevance scores (async, following docs)
-            # This matches: docs = await store.asimilarity_search_with_relevance_scores(query)
-            results = await vector_store.asimilarity_search_with_relevance_scores(
-                query=query,
-                k=k * 2,  # Get more results to filter by metadata
-            )
-            
-            # Filter results by company_id and type in metadata
-            filtered_results = []
-            for doc, score in results:
-                metadata = doc.metadata or {}
-                if (metadata.get("company_id") == company_id and 
-                    metadata.get("type") == "ticket_description"):
-                    filtered_results.append((doc, score))
-                    if len(filtered_results) >= k:
-                        break
+            rows = await _vector_search_tickets(query, company_id, k)
             
-            if filtered_results:
-                response_lines = [f"Se encontraron {len(filtered_results)} tickets relacionados:\n"]
+            if rows:
+                response_lines = [f"Se encontraron {len(rows)} tickets relacionados:\n"]
                 
-                for doc, score in filtered_results:
-                    ticket_id = doc.metadata.get("ticket_id")
-                    title = doc.metadata.get("title", "Sin título")
-                    customer_email = doc.metadata.get("customer_email", "Desconocido")
-                    priority = doc.metadata.get("priority", "medium")
-                    
-                    # Get ticket status from tickets table
-                    ticket_info = await supabase_async.table("tickets").select("status").eq("id", ticket_id).execute()
-                    status = ticket_info.data[0]["status"] if ticket_info.data else "unknown"
+                # Get ticket statuses from tickets table
+                statuses = await _ticket_statuses(supabase_async, [row["ticket_id"] for row in rows])
+                
+                for row in rows:
+                    ticket_id = row["ticket_id"]
+                    title = row["title"] or "Sin título"
+                    customer_email = row["customer_email"] or "Desconocido"
+                    priority = row["priority"] or "medium"
+                    status = statuses.get(ticket_id, "unknown")
+                    # Cosine relevance, as PGVectorStore's relevance scores
+                    score = 1.0 - row["distance"]
                     
                     response_lines.append(
                         f"- ID: {ticket_id}\n"
@@ -143,7 +178,7 @@ async def search(
                         f"  Estado: {status}\n"
                         f"  Prioridad: {priority}\n"
                         f"  Relevancia: {score:.3f}\n"
-                        f"  Resumen: {doc.page_content[:200]}...\n"
+                        f"  Resumen: {(row['content'] or '')[:200]}...\n"
                     )
                 
                 return "\n".join(response_lines)
@@ -161,40 +196,43 @@ async def search(
                 print(f"[DEBUG] Vector search traceback:", flush=True)
                 traceback.print_exc()
             
-            # Fallback to text search
-            docs_response = await supabase_async.table("documents").select("id, content, metadata").ilike("content", f"%{query}%").execute()
+            # Fallback to substring text search; the company/type filter and the limit run in the database
+            docs_response = await (
+                supabase_async.table("documents")
+                .select("content, metadata")
+                .eq("metadata->>company_id", company_id)
+                .eq("metadata->>type", "ticket_description")
+                .ilike("content", f"%{query}%")
+                .limit(k)
+                .execute()
+            )
             
             if docs_response.data:
-                filtered_docs = [
-                    doc for doc in docs_response.data
-                    if doc.get("metadata", {}).get("company_id") == company_id
-                    and doc.get("metadata", {}).get("type") == "ticket_description"
-                ]
+                docs = docs_response.data
+                response_lines = [f"Se encontraron {len(docs)} tickets relacionados (búsqueda por texto):\n"]
+                statuses = await _ticket_statuses(
+                    supabase_async, [(doc.get("metadata") or {}).get("ticket_id") for doc in docs]
+                )
                 
-                if filtered_docs:
-                    response_lines = [f"Se encontraron {min(len(filtered_docs), k)} tickets relacionados (búsqueda por texto):\n"]
-                    
-                    for doc in filtered_docs[:k]:
-                        metadata = doc.get("metadata", {})
-                        ticket_id = metadata.get("ticket_id")
-                        title = metadata.get("title", "Sin título")
-                        customer_email = metadata.get("customer_email", "Desconocido")
-                        priority = metadata.get("priority", "medium")
-                        
-                        ticket_info = await supabase_async.table("tickets").select("status").eq("id", ticket_id).execute()
-                        status = ticket_info.data[0]["status"] if ticket_info.data else "unknown"
-                        
-                        content = doc.get("content", "")
-                        response_lines.append(
-                            f"- ID: {ticket_id}\n"
-                            f"  Título: {title}\n"
-                            f"  Cliente: {customer_email}\n"
-                            f"  Estado: {status}\n"
-                            f"  Prioridad: {priority}\n"
-                            f"  Resumen: {content[:200]}...\n"
-                        )
+                for doc in docs:
+                    metadata = doc.get("metadata") or {}
+                    ticket_id = metadata.get("ticket_id")
+                    title = metadata.get("title", "Sin título")
+                    customer_email = metadata.get("customer_email", "Desconocido")
+                    priority = metadata.get("priority", "medium")
+                    status = statuses.get(ticket_id, "unknown")
                     
-                    return "\n".join(response_lines)
+                    content = doc.get("content") or ""
+                    response_lines.append(
+                        f"- ID: {ticket_id}\n"
+                        f"  Título: {title}\n"
+                        f"  Cliente: {customer_email}\n"
+                        f"  Estado: {status}\n"
+                        f"  Prioridad: {priority}\n"
+                        f"  Resumen: {content[:200]}...\n"
+                    )
+                
+                return "\n".join(response_lines)
         
         return "No se encontraron tickets relacionados con la búsqueda"
     except Exception as e:
@@ -114,58 +114,34 @@ class SkillMD(BaseModel):
         Renderiza el objeto SkillMD a un documento SKILL.md completamente formateado.
         """
 
-        md = []
-
-        # Frontmatter YAML
-        md.append("---")
-        md.append(f"name: {self.name}")
-        md.append(f"description: {self.description}")
-        md.append("---\n")
-
-        # Título
-        md.append(f"# {self.title}\n")
-
-        # Resumen
-        md.append("## Overview")
-        md.append(self.overview + "\n")
-
-        # Cuándo usar
-        md.append("## When to Use This Skill")
-        for item in self.when_to_use:
-            md.append(f"- {item}")
-        md.append("")
-
-        # Flujo de trabajo
-        md.append("## Instructions / Workflow")
-        for i, step in enumerate(self.workflow, start=1):
-            md.append(f"{i}. {step}")
-        md.append("")
+        # Una cadena por sección, cada una terminada en salto de línea; unidas con "\n" dejan una línea en blanco entre ellas
+        parts = [
+            # Frontmatter YAML
+            f"---\nname: {self.name}\ndescription: {self.description}\n---\n",
+            # Título
+            f"# {self.title}\n",
+            # Resumen
+            f"## Overview\n{self.overview}\n",
+            # Cuándo usar
+            "## When to Use This Skill" + "".join(f"\n- {item}" for item in self.when_to_use) + "\n",
+            # Flujo de trabajo
+            "## Instructions / Workflow" + "".join(f"\n{i}. {step}" for i, step in enumerate(self.workflow, start=1)) + "\n",
+        ]
 
         # Ejemplos
         if self.examples:
-            md.append("## Examples")
-            for example in self.examples:
-                md.append(example)
-                md.append("")
+            parts.append("## Examples" + "".join(f"\n{example}\n" for example in self.examples))
 
         # Restricciones
         if self.constraints:
-            md.append("## Constraints & Guardrails")
-            for rule in self.constraints:
-                md.append(f"- {rule}")
-            md.append("")
+            parts.append("## Constraints & Guardrails" + "".join(f"\n- {rule}" for rule in self.constraints) + "\n")
 
         # Activos y referencias
         if self.assets_and_references:
-            md.append("## Assets & References")
-            for asset in self.assets_and_references:
-                md.append(f"- {asset}")
-            md.append("")
+            parts.append("## Assets & References" + "".join(f"\n- {asset}" for asset in self.assets_and_references) + "\n")
 
         # Divulgación progresiva
         if self.progressive_disclosure_notes:
-            md.append("## Progressive Disclosure")
-            md.append(self.progressive_disclosure_notes)
-            md.append("")
+            parts.append(f"## Progressive Disclosure\n{self.progressive_disclosure_notes}\n")
 
-        return "\n".join(md)
\ No newline at end of file
+        return "\n".join(parts)
\ No newline at end of file
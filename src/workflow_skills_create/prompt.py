@@ -1,10 +1,36 @@
 from langsmith import Client
+import logging
 import os
+from pathlib import Path
 from dotenv import load_dotenv
+from langchain_core.load import dumps, loads
 from langchain_core.prompts import ChatPromptTemplate
 from datetime import datetime
 load_dotenv()
 
+# Last successfully pulled copy of each prompt: a LangSmith outage at startup falls back to it instead of failing the import.
+_PROMPT_CACHE_DIR = Path(os.path.expanduser("~/.cache/solven/prompts"))
+
+
+def _pull_prompt(prompt_id: str) -> ChatPromptTemplate:
+	"""Pull prompt_id from LangSmith, writing it through to the on-disk cache; read the cache when the pull fails."""
+	cache_file = _PROMPT_CACHE_DIR / f"{prompt_id}.json"
+	try:
+		pulled = client.pull_prompt(prompt_id)
+	except Exception as e:
+		if not cache_file.is_file():
+			raise
+		logging.warning("pull_prompt failed (%s), using cached copy of prompt_id=%s", e, prompt_id)
+		return loads(cache_file.read_text(encoding="utf-8"))
+	try:
+		_PROMPT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+		cache_file.write_text(dumps(pulled), encoding="utf-8")
+	except Exception as e:
+		logging.warning("could not cache prompt_id=%s: %s", prompt_id, e)
+	return pulled
+
 
 client = Client()
-prompt : ChatPromptTemplate = client.pull_prompt("solven-skills-create")
\ No newline at end of file
+prompt : ChatPromptTemplate = _pull_prompt("solven-skills-create")
+# The template has no variables: render it once for the agent's system prompt.
+SYSTEM_PROMPT = prompt.format()
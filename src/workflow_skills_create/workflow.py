@@ -5,11 +5,11 @@ from langgraph.graph.state import Command
 from src.llm import LLM_SO
 from src.workflow_skills_create.models import SkillMD
 from src.workflow_skills_create.tools import escribir_skill_md
-from src.workflow_skills_create.prompt import prompt
+from src.workflow_skills_create.prompt import SYSTEM_PROMPT
 
 agent = create_agent(
     model=LLM_SO,
     tools=[escribir_skill_md],
-    system_prompt=prompt.format(),
+    system_prompt=SYSTEM_PROMPT,
     response_format=SkillMD
 )
\ No newline at end of file
@@ -7,135 +7,38 @@ fast, and reliable agent execution environments.
 import json
 import os
 from pathlib import Path
-from typing import Dict, List, Optional
+from string import Template
+from typing import Dict, List, Tuple
 import yaml
 
+try:
+    import orjson
+except ImportError:  # optional (a langsmith dependency); stdlib json is the fallback
+    orjson = None
 
-class WorkspaceTemplate:
-    """Manages workspace templates for quick initialization."""
-    
-    # Template directory (relative to project root)
-    TEMPLATE_DIR = Path(__file__).parent.parent / "workspace-templates"
-    
-    @classmethod
-    def list_templates(cls) -> List[str]:
-        """List available workspace templates."""
-        if not cls.TEMPLATE_DIR.exists():
-            return []
-        
-        templates = []
-        for file in cls.TEMPLATE_DIR.glob("*.yaml"):
-            templates.append(file.stem)
-        
-        return sorted(templates)
-    
-    @classmethod
-    def load_template(cls, name: str = "default") -> Dict:
-        """
-        Load template configuration from YAML.
-        
-        Args:
-            name: Template name (e.g., "default", "data-science", "minimal")
-            
-        Returns:
-            Dictionary with template configuration
-            
-        Raises:
-            FileNotFoundError: If template doesn't exist
-        """
-        template_path = cls.TEMPLATE_DIR / f"{name}.yaml"
-        
-        if not template_path.exists():
-            available = cls.list_templates()
-            raise FileNotFoundError(
-                f"Template '{name}' not found. "
-                f"Available templates: {', '.join(available)}"
-            )
-        
-        with open(template_path, 'r') as f:
-            template = yaml.safe_load(f)
-        
-        return template
-    
-    @classmethod
-    def create_pyproject_toml(cls, template: Dict) -> str:
-        """
-        Generate pyproject.toml content from template.
-        
-        Args:
-            template: Template configuration dictionary
-            
-        Returns:
-            pyproject.toml content as string
-        """
-        python_config = template.get('python', {})
-        version = python_config.get('version', '3.12')
-        dependencies = python_config.get('dependencies', [])
-        
-        # Build pyproject.toml
-        pyproject = {
-            "project": {
-                "name": "workspace",
-                "version": "0.1.0",
-                "description": f"Workspace from template: {template.get('name', 'unknown')}",
-                "requires-python": f">={version}",
-                "dependencies": dependencies
-            },
-            "tool": {
-                "uv": {
-                    "dev-dependencies": []
-                }
-            }
-        }
-        
-        # Convert to TOML format manually (simple approach)
-        toml_lines = [
-            "[project]",
-            f'name = "workspace"',
-            f'version = "0.1.0"',
-            f'description = "Workspace from template: {template.get("name", "unknown")}"',
-            f'requires-python = ">={version}"',
-            'dependencies = [',
-        ]
-        
-        for dep in dependencies:
-            toml_lines.append(f'    "{dep}",')
-        
-        toml_lines.append(']')
-        toml_lines.append('')
-        toml_lines.append('[tool.uv]')
-        toml_lines.append('dev-dependencies = []')
-        
-        return '\n'.join(toml_lines)
-    
-    @classmethod
-    def create_package_json(cls, template: Dict) -> str:
-        """
-        Generate package.json content from template.
-        
-        Args:
-            template: Template configuration dictionary
-            
-        Returns:
-            package.json content as string
-        """
-        nodejs_config = template.get('nodejs', {})
-        dependencies = nodejs_config.get('dependencies', {})
-        
-        package_json = {
-            "name": "workspace",
-            "version": "1.0.0",
-            "type": "module",
-            "description": f"Workspace from template: {template.get('name', 'unknown')}",
-            "dependencies": dependencies
-        }
-        
-        return json.dumps(package_json, indent=2)
-    
-    @classmethod
-    def create_gitignore(cls) -> str:
-        """Generate standard .gitignore for workspace."""
-        return """# Python
+# libyaml-backed loader when PyYAML was built with it (same safe semantics, parsing in C)
+_YAML_SAFE_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+# package.json for templates without Node dependencies; only the description varies
+_EMPTY_PACKAGE_JSON = Template("""{
+  "name": "workspace",
+  "version": "1.0.0",
+  "type": "module",
+  "description": $description,
+  "dependencies": {}
+}""")
+
+
+def _dumps_indented(obj) -> str:
+    """Serialize to 2-space-indented JSON (non-ASCII kept as UTF-8), with orjson's native encoder when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+# Standard .gitignore written into every workspace (same for all templates)
+_WORKSPACE_GITIGNORE = """# Python
 __pycache__/
 *.py[cod]
 *$py.class
@@ -178,49 +81,28 @@ Thumbs.db
 *.xlsx
 *.docx
 """
-    
-    @classmethod
-    def create_readme(cls, template: Dict) -> str:
-        """Generate README for workspace."""
-        name = template.get('name', 'unknown')
-        description = template.get('description', 'No description')
-        python_version = template.get('python', {}).get('version', '3.12')
-        nodejs_version = template.get('nodejs', {}).get('version', '20')
-        
-        readme = f"""# Workspace
 
-**Template**: {name}  
-**Description**: {description}
+
+# Workspace README skeleton; create_readme fills in the template fields and package lists
+_README_TEMPLATE = Template("""# Workspace
+
+**Template**: $name  
+**Description**: $description
 
 ## Environment
 
-- **Python**: {python_version}
-- **Node.js**: {nodejs_version}
+- **Python**: $python_version
+- **Node.js**: $nodejs_version
 - **Runtime**: Bun
 
 ## Python Packages
 
-"""
-        
-        # List Python packages
-        python_deps = template.get('python', {}).get('dependencies', [])
-        if python_deps:
-            for dep in python_deps:
-                readme += f"- {dep}\n"
-        else:
-            readme += "- None\n"
-        
-        readme += "\n## Node.js Packages\n\n"
-        
-        # List Node packages
-        node_deps = template.get('nodejs', {}).get('dependencies', {})
-        if node_deps:
-            for pkg, version in node_deps.items():
-                readme += f"- {pkg}@{version}\n"
-        else:
-            readme += "- None\n"
-        
-        readme += """
+$python_block
+
+## Node.js Packages
+
+$node_block
+
 ## Usage
 
 This workspace is automatically configured and ready to use.
@@ -249,41 +131,229 @@ persist across sessions and are stored securely.
 ---
 
 *This workspace was automatically generated and configured.*
-"""
+""")
+
+
+class WorkspaceTemplate:
+    """Manages workspace templates for quick initialization."""
+    
+    # Template directory (relative to project root)
+    TEMPLATE_DIR = Path(__file__).parent.parent / "workspace-templates"
+    # String form for per-load path building (cheaper than Path arithmetic)
+    _TEMPLATE_DIR_STR = str(TEMPLATE_DIR)
+    # Parsed templates: name -> (file mtime_ns, template)
+    _cache: Dict[str, Tuple[int, Dict]] = {}
+    # Sorted template names with the directory mtime_ns they were listed at
+    _listing_cache: Tuple[int, Tuple[str, ...]] | None = None
+    
+    @classmethod
+    def list_templates(cls) -> List[str]:
+        """List available workspace templates (rescanned only when the directory changes)."""
+        try:
+            dir_mtime_ns = os.stat(cls._TEMPLATE_DIR_STR).st_mtime_ns
+            listing = cls._listing_cache
+            if listing is None or listing[0] != dir_mtime_ns:
+                with os.scandir(cls._TEMPLATE_DIR_STR) as entries:
+                    # Suffix stripped before sorting: "a-b.yaml" < "a.yaml" but "a" < "a-b"
+                    names = [e.name[:-5] for e in entries if e.name.endswith(".yaml") and e.is_file()]
+                names.sort()
+                listing = cls._listing_cache = (dir_mtime_ns, tuple(names))
+        except FileNotFoundError:
+            return []
         
-        return readme
+        return list(listing[1])
+    
+    @classmethod
+    def load_template(cls, name: str = "default") -> Dict:
+        """
+        Load template configuration from YAML.
+        
+        Args:
+            name: Template name (e.g., "default", "data-science", "minimal")
+            
+        Returns:
+            Dictionary with template configuration. Cached until the file's mtime changes and
+            shared between callers: treat it as read-only.
+            
+        Raises:
+            FileNotFoundError: If template doesn't exist
+        """
+        template_path = f"{cls._TEMPLATE_DIR_STR}/{name}.yaml"
+        
+        try:
+            mtime_ns = os.stat(template_path).st_mtime_ns
+        except FileNotFoundError:
+            available = cls.list_templates()
+            raise FileNotFoundError(
+                f"Template '{name}' not found. "
+                f"Available templates: {', '.join(available)}"
+            ) from None
+        
+        cached = cls._cache.get(name)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        
+        with open(template_path, 'rb') as f:
+            template = yaml.load(f, Loader=_YAML_SAFE_LOADER)
+        
+        cls._cache[name] = (mtime_ns, template)
+        return template
+    
+    @classmethod
+    def create_workspace_files(cls, template: Dict) -> Dict[str, str]:
+        """Generate every workspace file from template in one pass.
+        
+        The template sections are read once and shared by all builders.
+        
+        Args:
+            template: Template configuration dictionary
+            
+        Returns:
+            Mapping of file name (pyproject.toml, package.json, .gitignore, README.md) to content
+        """
+        name = template.get('name', 'unknown')
+        python_config = template.get('python', {})
+        node_config = template.get('nodejs', {})
+        
+        return {
+            "pyproject.toml": cls._pyproject_toml(name, python_config),
+            "package.json": cls._package_json(name, node_config),
+            ".gitignore": _WORKSPACE_GITIGNORE,
+            "README.md": cls._readme(
+                name, template.get('description', 'No description'), python_config, node_config
+            ),
+        }
+    
+    @classmethod
+    def create_pyproject_toml(cls, template: Dict) -> str:
+        """
+        Generate pyproject.toml content from template.
+        
+        Args:
+            template: Template configuration dictionary
+            
+        Returns:
+            pyproject.toml content as string
+        """
+        return cls._pyproject_toml(template.get('name', 'unknown'), template.get('python', {}))
+    
+    @staticmethod
+    def _pyproject_toml(name: str, python_config: Dict) -> str:
+        version = python_config.get('version', '3.12')
+        deps_block = "".join(f'    "{dep}",\n' for dep in python_config.get('dependencies', []))
+        return (
+            "[project]\n"
+            'name = "workspace"\n'
+            'version = "0.1.0"\n'
+            f'description = "Workspace from template: {name}"\n'
+            f'requires-python = ">={version}"\n'
+            "dependencies = [\n"
+            f"{deps_block}"
+            "]\n"
+            "\n"
+            "[tool.uv]\n"
+            "dev-dependencies = []"
+        )
+    
+    @classmethod
+    def create_package_json(cls, template: Dict) -> str:
+        """
+        Generate package.json content from template.
+        
+        Args:
+            template: Template configuration dictionary
+            
+        Returns:
+            package.json content as string
+        """
+        return cls._package_json(template.get('name', 'unknown'), template.get('nodejs', {}))
+    
+    @staticmethod
+    def _package_json(name: str, nodejs_config: Dict) -> str:
+        dependencies = nodejs_config.get('dependencies', {})
+        description = f"Workspace from template: {name}"
+        if not dependencies:
+            # Same encoder as the full path, so non-ASCII names are escaped (or not) identically
+            return _EMPTY_PACKAGE_JSON.substitute(description=_dumps_indented(description))
+        
+        package_json = {
+            "name": "workspace",
+            "version": "1.0.0",
+            "type": "module",
+            "description": description,
+            "dependencies": dependencies
+        }
+        
+        return _dumps_indented(package_json)
+    
+    @classmethod
+    def create_gitignore(cls) -> str:
+        """Generate standard .gitignore for workspace."""
+        return _WORKSPACE_GITIGNORE
+    
+    @classmethod
+    def create_readme(cls, template: Dict) -> str:
+        """Generate README for workspace."""
+        return cls._readme(
+            template.get('name', 'unknown'),
+            template.get('description', 'No description'),
+            template.get('python', {}),
+            template.get('nodejs', {}),
+        )
+    
+    @staticmethod
+    def _readme(name: str, description: str, python_config: Dict, node_config: Dict) -> str:
+        python_deps = python_config.get('dependencies', [])
+        node_deps = node_config.get('dependencies', {})
+        
+        return _README_TEMPLATE.substitute(
+            name=name,
+            description=description,
+            python_version=python_config.get('version', '3.12'),
+            nodejs_version=node_config.get('version', '20'),
+            python_block="\n".join(f"- {dep}" for dep in python_deps) or "- None",
+            node_block="\n".join(f"- {pkg}@{version}" for pkg, version in node_deps.items()) or "- None",
+        )
     
     @classmethod
     def get_template_info(cls, name: str) -> Dict:
         """
-        Get information about a template without loading full config.
+        Get summary information about a template.
+        
+        Served from the parsed-template cache of ``load_template`` (a stat per call; the YAML is
+        parsed once per file change), so summaries of every template cost no repeated parsing.
         
         Args:
             name: Template name
             
         Returns:
-            Dictionary with template info (name, description, packages count)
+            Dictionary with template info (name, description, packages count). Plain values
+            only: package counts are ``len()`` of the cached lists, no dependency list is kept.
         """
         try:
             template = cls.load_template(name)
-            
-            python_deps = len(template.get('python', {}).get('dependencies', []))
-            node_deps = len(template.get('nodejs', {}).get('dependencies', {}))
+            python_config = template.get('python', {})
+            node_config = template.get('nodejs', {})
             
             return {
                 "name": name,
                 "version": template.get('version', 'unknown'),
                 "description": template.get('description', ''),
-                "python_packages": python_deps,
-                "node_packages": node_deps,
-                "python_version": template.get('python', {}).get('version', 'unknown'),
-                "nodejs_version": template.get('nodejs', {}).get('version', 'unknown'),
+                "python_packages": len(python_config.get('dependencies', [])),
+                "node_packages": len(node_config.get('dependencies', {})),
+                "python_version": python_config.get('version', 'unknown'),
+                "nodejs_version": node_config.get('version', 'unknown'),
             }
         except FileNotFoundError:
             return {
                 "name": name,
                 "error": "Template not found"
             }
+    
+    @classmethod
+    def list_template_infos(cls) -> List[Dict]:
+        """``get_template_info`` for every available template, from one directory listing."""
+        return [cls.get_template_info(name) for name in cls.list_templates()]
 
 
 # Example usage
@@ -298,16 +368,14 @@ if __name__ == "__main__":
     print(f"Description: {template['description']}")
     
     # Generate configuration files
-    pyproject = WorkspaceTemplate.create_pyproject_toml(template)
+    files = WorkspaceTemplate.create_workspace_files(template)
     print("\n=== pyproject.toml ===")
-    print(pyproject)
+    print(files["pyproject.toml"])
     
-    package_json = WorkspaceTemplate.create_package_json(template)
     print("\n=== package.json ===")
-    print(package_json)
+    print(files["package.json"])
     
     # Get template info
-    for tmpl_name in templates:
-        info = WorkspaceTemplate.get_template_info(tmpl_name)
+    for info in WorkspaceTemplate.list_template_infos():
         print(f"\n{info['name']}: {info['python_packages']} Python + {info['node_packages']} Node packages")
 
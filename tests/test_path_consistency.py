@@ -18,7 +18,7 @@ from src.agent.state import AppContext, User, Thread, Ticket
 class TestPathConsistency:
     """Test that all operations present a consistent filesystem view."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def backend(self):
         """Create a test backend instance."""
         context = AppContext(
@@ -113,7 +113,7 @@ class TestPathConsistency:
 class TestPathSecurity:
     """Test that path security checks prevent escape attempts."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def backend(self):
         context = AppContext(
             user=User(id="test-user"),
@@ -122,36 +122,31 @@ class TestPathSecurity:
         )
         return SandboxBackend(context)
     
-    def test_reject_absolute_escape(self, backend):
+    @pytest.mark.parametrize("dangerous_path", [
+        "/mnt/r2/other-thread/",
+        "/etc/passwd",
+        "/root/.ssh/",
+    ])
+    def test_reject_absolute_escape(self, backend, dangerous_path):
         """Test that absolute paths outside workspace are rejected."""
-        dangerous_paths = [
-            "/mnt/r2/other-thread/",
-            "/etc/passwd",
-            "/root/.ssh/",
-        ]
-        
-        for dangerous_path in dangerous_paths:
-            with pytest.raises((ValueError, Exception)):
-                backend._key(dangerous_path)
-    
-    def test_reject_relative_escape(self, backend):
+        with pytest.raises((ValueError, Exception)):
+            backend._key(dangerous_path)
+    
+    @pytest.mark.parametrize("attempt", [
+        "/../../../etc/passwd",
+        "/folder/../../other-thread/",
+    ])
+    def test_reject_relative_escape(self, backend, attempt):
         """Test that relative path escapes are handled."""
-        # These should be rejected or sanitized
-        escape_attempts = [
-            "/../../../etc/passwd",
-            "/folder/../../other-thread/",
-        ]
-        
-        for attempt in escape_attempts:
-            # Either raises ValueError or sanitizes to safe path
-            try:
-                key = backend._key(attempt)
-                # If it doesn't raise, verify it's still within base_path
-                assert key.startswith(backend._base_path) or \
-                       key.startswith(backend._r2_skills_path)
-            except ValueError:
-                # This is also acceptable - path was rejected
-                pass
+        # Either raises ValueError or sanitizes to safe path
+        try:
+            key = backend._key(attempt)
+            # If it doesn't raise, verify it's still within base_path
+            assert key.startswith(backend._base_path) or \
+                   key.startswith(backend._r2_skills_path)
+        except ValueError:
+            # This is also acceptable - path was rejected
+            pass
 
 
 if __name__ == "__main__":
@@ -0,0 +1,69 @@
+"""Unit tests for the read-only command classifier that lets execute() skip the post-command S3 sync."""
+import pytest
+
+from src.sandbox_backend import _command_is_read_only
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        "ls -la",
+        "cat notes.txt",
+        "head -n 5 data.csv | wc -l",
+        "grep -rn factura .",
+        "rg acta docs",
+        "find . -name '*.pdf'",
+        "cd docs && ls",
+        "ls missing 2>/dev/null",
+        "grep foo f 2>&1",
+        "du -sh .",
+        "git status",
+        "git log --oneline -5",
+        "git diff HEAD~1 | head",
+    ],
+)
+def test_read_only_commands(command: str) -> None:
+    """Allow-listed programs without file redirections skip the sync."""
+    assert _command_is_read_only(command)
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        "find . -delete",
+        "find . -name '*.tmp' -exec rm {} +",
+        "rsync -a a b",
+        "unlink f",
+        "shred -u f",
+        "split -l 100 big.csv",
+        "sed -e s/a/b/ -i f",
+        "7z x archive.7z",
+        "pdftotext a.pdf b.txt",
+        "convert a.png b.jpg",
+        "qpdf in.pdf out.pdf",
+        "sqlite3 db",
+        "gcc -o app app.c",
+        "cargo build",
+        "go build",
+        "yarn build",
+        "pnpm i",
+        "php script.php",
+        "ruby script.rb",
+        "java Main",
+        "echo hi > f",
+        "cat a >> b",
+        "cat a | tee b",
+        "ls && rm x",
+        "ls $(touch x)",
+        "FOO=1 ls",
+        "git checkout main",
+        "git pull",
+        "git stash",
+        "git -C docs status",
+        "git diff --output=patch.diff",
+        "git",
+    ],
+)
+def test_commands_that_may_write(command: str) -> None:
+    """Anything not provably read-only keeps the sync (a missed write would lose data)."""
+    assert not _command_is_read_only(command)
@@ -0,0 +1,31 @@
+"""Unit tests for keyword-based skill matching (prompt candidates and the LLM fallback)."""
+from types import SimpleNamespace
+
+from src.utils.skills import _prompt_skill_candidates, match_skills_with_keywords
+
+
+def _skill(name: str, description: str) -> SimpleNamespace:
+    return SimpleNamespace(name=name, description=description)
+
+
+def test_plural_message_matches_singular_keyword() -> None:
+    """'facturas' in the conversation still reaches a skill described with 'factura'."""
+    facturas = _skill("emitir-facturas", "Genera una factura para el cliente")
+    other = _skill("resumen-reunion", "Resume la reunión")
+
+    assert _prompt_skill_candidates([facturas, other], "Necesito revisar las facturas de marzo") == [facturas]
+    assert match_skills_with_keywords([facturas, other], "revisa las facturas") == [facturas]
+
+
+def test_accents_and_inflections_match() -> None:
+    """Accents and plural endings are normalized on both sides (acción / acciones, inmueble / inmuebles)."""
+    acciones = _skill("gestionar-acciones", "Registra una acción sobre el inmueble")
+
+    assert _prompt_skill_candidates([acciones], "Crear ACCION para los inmuebles") == [acciones]
+
+
+def test_unrelated_conversation_has_no_candidates() -> None:
+    """No keyword hit: no candidates, so the LLM matcher is skipped."""
+    skills = [_skill("emitir-facturas", "Genera una factura para el cliente")]
+
+    assert _prompt_skill_candidates(skills, "Hola, ¿qué tal?") == []